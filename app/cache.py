@@ -5,123 +5,268 @@ Provides efficient caching with TTL support and memory management.
 
 import time
 import hashlib
-from typing import Any, Dict, Optional, Callable, TypeVar, Generic
+import heapq
+import inspect
+import itertools
+import math
+import pickle
+import queue
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from threading import Lock
 from app.config import config
 from app.logging_config import get_logger
 
+try:
+    import xxhash
+except ImportError:  # Optional accelerator; hashlib is the fallback
+    xxhash = None
+
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+if xxhash is not None:
+    _digest_key = xxhash.xxh3_128_intdigest
+else:
+
+    def _digest_key(buf: bytes) -> int:
+        return int.from_bytes(hashlib.md5(buf).digest(), "big")
+
+
+_NS_PER_SECOND = 1_000_000_000
+
+# Lifetime used for ttl=math.inf; beyond any time.monotonic_ns() reading
+_FOREVER_NS = 1 << 63
+
+# Marks a cache miss where None is a legitimate cached value
+_MISSING = object()
+
+# Smallest per-shard capacity worth splitting a cache for
+_MIN_SHARD_SIZE = 8
+
+
+class _CacheShard:
+    """One independently locked slice of a TTLCache.
+
+    ``data`` maps keys to ``(value, expires)`` tuples in least- to
+    most-recently-used order, with ``expires`` in ``time.monotonic_ns()``
+    units; ``heap`` orders ``(expires, seq, key)`` records so expired entries
+    can be popped without scanning. Heap records whose expiry no longer
+    matches ``data`` are stale and are skipped.
+    """
+
+    __slots__ = ("data", "heap", "seq", "lock", "hits", "misses")
+
+    def __init__(self):
+        self.data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.heap: List[Tuple[int, int, Hashable]] = []
+        self.seq = itertools.count()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
 
 class TTLCache(Generic[T]):
-    """Thread-safe TTL (Time-To-Live) cache with automatic cleanup."""
+    """Thread-safe TTL (Time-To-Live) cache with automatic cleanup.
+
+    Entries are spread over independently locked shards, so threads working
+    on different keys rarely contend. Each shard holds at most
+    ``max_size // shard count`` entries and, when full, evicts its own least
+    recently used entry. The total therefore never exceeds ``max_size``, but
+    eviction can start before the cache as a whole is full, and LRU order
+    only holds within a shard.
+    """
 
-    def __init__(self, default_ttl: int = 3600, max_size: int = 1000):
+    def __init__(self, default_ttl: int = 3600, max_size: int = 1000, shards: int = 16):
         """
         Initialize TTL cache.
 
         Args:
             default_ttl: Default TTL in seconds
-            max_size: Maximum cache size before cleanup
+            max_size: Maximum total number of entries; divided evenly
+                between shards, see the class docstring
+            shards: Maximum number of lock stripes (rounded down to a power
+                of two; small caches use fewer so each shard keeps room for
+                at least _MIN_SHARD_SIZE entries)
         """
         self.default_ttl = default_ttl
         self.max_size = max_size
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._lock = Lock()
-        self._hits = 0
-        self._misses = 0
+
+        shard_count = 1
+        while shard_count * 2 <= min(shards, max_size // _MIN_SHARD_SIZE):
+            shard_count *= 2
+        self._shard_mask = shard_count - 1
+        self._shard_max_size = max(1, max_size // shard_count)
+        self._shards = [_CacheShard() for _ in range(shard_count)]
+
+    def _shard(self, key: Hashable) -> _CacheShard:
+        """Return the shard responsible for a key."""
+        return self._shards[hash(key) & self._shard_mask]
 
     def _make_key(self, *args, **kwargs) -> str:
         """Generate a cache key from arguments."""
         key_data = str(args) + str(sorted(kwargs.items()))
         return hashlib.md5(key_data.encode()).hexdigest()
 
-    def get(self, key: str, default: Any = None) -> Any:
+    def __contains__(self, key: Hashable) -> bool:
+        """Check for a live entry without fetching it.
+
+        Membership tests are not counted as hits or misses and do not refresh
+        the entry's LRU position; only get() does.
+        """
+        # A single dict lookup is atomic, so no shard lock is needed
+        entry = self._shard(key).data.get(key)
+        return entry is not None and time.monotonic_ns() < entry[1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
         """Get value from cache."""
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if time.time() < entry["expires"]:
-                    self._hits += 1
-                    return entry["value"]
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.data.get(key)
+            if entry is not None:
+                if time.monotonic_ns() < entry[1]:
+                    shard.data.move_to_end(key)
+                    shard.hits += 1
+                    return entry[0]
                 else:
                     # Expired entry
-                    del self._cache[key]
+                    del shard.data[key]
 
-            self._misses += 1
+            shard.misses += 1
             return default
 
-    def set(self, key: str, value: T, ttl: Optional[int] = None) -> None:
-        """Set value in cache with optional TTL."""
+    def set(self, key: Hashable, value: T, ttl: Optional[float] = None) -> None:
+        """Set value in cache with optional TTL.
+
+        ``ttl=math.inf`` keeps the entry until it is evicted or deleted; a
+        NaN TTL raises ValueError.
+        """
         if ttl is None:
             ttl = self.default_ttl
 
-        with self._lock:
-            # Clean up if cache is getting too large
-            if len(self._cache) >= self.max_size:
-                self._cleanup_expired()
-
-            if len(self._cache) >= self.max_size:
-                # Remove oldest entries (simple LRU approximation)
-                oldest_key = min(
-                    self._cache.keys(), key=lambda k: self._cache[k]["expires"]
-                )
-                del self._cache[oldest_key]
-
-            self._cache[key] = {
-                "value": value,
-                "expires": time.time() + ttl,
-                "created": time.time(),
-            }
-
-    def delete(self, key: str) -> bool:
+        if math.isfinite(ttl):
+            lifetime = int(ttl * _NS_PER_SECOND)
+        elif math.isnan(ttl):
+            raise ValueError("Cache TTL must be a number of seconds, not NaN")
+        else:
+            lifetime = _FOREVER_NS if ttl > 0 else -_FOREVER_NS
+
+        shard = self._shard(key)
+        with shard.lock:
+            data = shard.data
+            expires = time.monotonic_ns() + lifetime
+            data[key] = (value, expires)
+            data.move_to_end(key)
+            if len(data) > self._shard_max_size:
+                data.popitem(last=False)
+
+            heap = shard.heap
+            heapq.heappush(heap, (expires, next(shard.seq), key))
+
+            # Overwrites, evictions and deletes leave stale heap records behind
+            if len(heap) > 2 * len(data) + _MIN_SHARD_SIZE:
+                self._rebuild_heap(shard)
+
+    def delete(self, key: Hashable) -> bool:
         """Delete key from cache."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.data:
+                del shard.data[key]
                 return True
             return False
 
     def clear(self) -> None:
         """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-            self._hits = 0
-            self._misses = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard.data.clear()
+                shard.heap.clear()
+                shard.hits = 0
+                shard.misses = 0
+
+    @staticmethod
+    def _cleanup_shard(shard: _CacheShard, current_time: int) -> int:
+        """Remove expired entries from one shard (caller holds its lock)."""
+        data = shard.data
+        heap = shard.heap
+        cleaned = 0
+        while heap and heap[0][0] <= current_time:
+            expires, _, key = heapq.heappop(heap)
+            entry = data.get(key)
+            if entry is not None and entry[1] == expires:
+                del data[key]
+                cleaned += 1
+
+        return cleaned
+
+    @staticmethod
+    def _rebuild_heap(shard: _CacheShard) -> None:
+        """Drop stale heap records (caller holds the lock)."""
+        seq = shard.seq
+        heap = [(entry[1], next(seq), key) for key, entry in shard.data.items()]
+        heapq.heapify(heap)
+        shard.heap = heap
 
     def _cleanup_expired(self) -> int:
         """Remove expired entries."""
-        current_time = time.time()
-        expired_keys = [
-            key
-            for key, entry in self._cache.items()
-            if current_time >= entry["expires"]
-        ]
-
-        for key in expired_keys:
-            del self._cache[key]
-
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-
-        return len(expired_keys)
+        current_time = time.monotonic_ns()
+        cleaned = 0
+        for shard in self._shards:
+            with shard.lock:
+                cleaned += self._cleanup_shard(shard, current_time)
+
+        if cleaned:
+            logger.debug(f"Cleaned up {cleaned} expired cache entries")
+
+        return cleaned
+
+    def snapshot(self) -> Tuple[int, int, int]:
+        """Read (hits, misses, size), holding each shard lock only for its counters."""
+        size = hits = misses = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.data)
+                hits += shard.hits
+                misses += shard.misses
+        return hits, misses, size
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        with self._lock:
-            total_requests = self._hits + self._misses
-            hit_rate = (self._hits / total_requests) if total_requests > 0 else 0
+        hits, misses, size = self.snapshot()
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests) if total_requests > 0 else 0
+
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "shards": len(self._shards),
+            "shard_max_size": self._shard_max_size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hit_rate,
+            "total_requests": total_requests,
+        }
+
 
-            return {
-                "size": len(self._cache),
-                "max_size": self.max_size,
-                "hits": self._hits,
-                "misses": self._misses,
-                "hit_rate": hit_rate,
-                "total_requests": total_requests,
-            }
+def _is_method(func: Callable) -> bool:
+    """Whether func's first parameter is ``self`` or ``cls``."""
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+    return next(iter(params), None) in ("self", "cls")
 
 
 class CachedFunction:
@@ -132,13 +277,23 @@ class CachedFunction:
         self.ttl = ttl
 
     def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        # Calls with a single str argument (e.g. reflection text) are keyed by
+        # digesting the UTF-8 text directly, skipping the pickle round trip
+        str_key_prefix = f"str\0{func.__module__}\0{func.__qualname__}\0".encode()
+        keyed_by_identity = _is_method(func)
+
         def wrapper(*args, **kwargs) -> T:
             # Create cache key
-            key = self._make_func_key(func, args, kwargs)
+            if not kwargs and len(args) == 1 and type(args[0]) is str:
+                key = _digest_key(
+                    str_key_prefix + args[0].encode("utf-8", "surrogatepass")
+                )
+            else:
+                key = self._make_func_key(func, args, kwargs, keyed_by_identity)
 
             # Try to get from cache
-            cached_result = self.cache.get(key)
-            if cached_result is not None:
+            cached_result = self.cache.get(key, _MISSING)
+            if cached_result is not _MISSING:
                 logger.debug(f"Cache hit for {func.__name__}")
                 return cached_result
 
@@ -157,8 +312,32 @@ class CachedFunction:
 
         return wrapper
 
-    def _make_func_key(self, func: Callable, args: tuple, kwargs: dict) -> str:
-        """Generate cache key for function call."""
+    def _make_func_key(
+        self, func: Callable, args: tuple, kwargs: dict, keyed_by_identity: bool = False
+    ) -> Any:
+        """Generate cache key for function call.
+
+        With ``keyed_by_identity`` the first argument (a method's ``self`` or
+        ``cls``) is keyed by type and id() rather than pickled, so an
+        instance keeps one key whatever state it is in.
+        """
+        if keyed_by_identity and args:
+            owner = args[0]
+            args = (f"{type(owner).__qualname__}@{id(owner):x}",) + args[1:]
+        try:
+            buf = pickle.dumps(
+                (func.__module__, func.__qualname__, args, sorted(kwargs.items())),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable arguments (e.g. objects holding locks or sockets)
+            # fall back to their string form
+            return self._make_str_key(func, args, kwargs)
+        return _digest_key(buf)
+
+    @staticmethod
+    def _make_str_key(func: Callable, args: tuple, kwargs: dict) -> str:
+        """Generate cache key from the string form of the arguments."""
         key_parts = [func.__module__, func.__name__]
         key_parts.extend(str(arg) for arg in args)
         key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
@@ -167,32 +346,42 @@ class CachedFunction:
 
 
 class ConnectionPool:
-    """Simple connection pool for managing resources."""
+    """Simple connection pool for managing resources.
 
-    def __init__(self, factory: Callable[[], Any], max_size: int = 10):
+    Idle connections live in a ``queue.SimpleQueue``, so ``get``/``put`` need
+    no Python-level lock. Pass ``prewarm`` to create that many connections up
+    front instead of on first use.
+    """
+
+    def __init__(
+        self, factory: Callable[[], Any], max_size: int = 10, prewarm: int = 0
+    ):
         self.factory = factory
         self.max_size = max_size
-        self._pool = []
-        self._lock = Lock()
+        self._pool: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        for _ in range(min(prewarm, max_size)):
+            self._pool.put(factory())
 
     def get(self) -> Any:
         """Get a connection from the pool."""
-        with self._lock:
-            if self._pool:
-                return self._pool.pop()
-            else:
-                return self.factory()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self.factory()
 
     def put(self, connection: Any) -> None:
         """Return a connection to the pool."""
-        with self._lock:
-            if len(self._pool) < self.max_size:
-                self._pool.append(connection)
+        # Unlocked size check: concurrent puts may overshoot max_size slightly
+        if self._pool.qsize() < self.max_size:
+            self._pool.put(connection)
 
     def clear(self) -> None:
         """Clear all connections in the pool."""
-        with self._lock:
-            self._pool.clear()
+        try:
+            while True:
+                self._pool.get_nowait()
+        except queue.Empty:
+            pass
 
 
 # Global cache instances
@@ -228,6 +228,67 @@ class EncryptedVault:
             logger.error(f"Encryption error: {e}")
             raise EncryptionError("Failed to encrypt reflection") from e
 
+    def add_reflections_bulk(self, texts: List[str]) -> List[int]:
+        """
+        Encrypts and stores several reflections in a single transaction.
+
+        Args:
+            texts (List[str]): The raw reflection texts.
+
+        Returns:
+            List[int]: The IDs of the inserted reflections, in input order.
+
+        Raises:
+            ValidationError: If any input fails validation (nothing is stored)
+            DatabaseError: If database operation fails
+        """
+        # Validate everything before touching the database
+        validated = [InputValidator.validate_reflection_text(text) for text in texts]
+        if not validated:
+            return []
+
+        try:
+            import hashlib
+
+            rows = []
+            for validated_text in validated:
+                text_bytes = validated_text.encode("utf-8")
+                rows.append(
+                    (
+                        self.cipher.encrypt(text_bytes),
+                        hashlib.sha256(text_bytes).hexdigest(),
+                    )
+                )
+
+            # The connection is in autocommit mode, so open the transaction
+            # explicitly; IMMEDIATE takes the write lock up front, which keeps
+            # the AUTOINCREMENT IDs of this batch contiguous
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    """
+                    INSERT INTO reflections (encrypted_text, checksum)
+                    VALUES (?, ?)
+                    """,
+                    rows,
+                )
+                last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+            first_id = last_id - len(rows) + 1
+            logger.info(f"Stored {len(rows)} reflections (IDs {first_id}-{last_id})")
+            return list(range(first_id, last_id + 1))
+
+        except sqlite3.Error as e:
+            logger.error(f"Database error storing reflections: {e}")
+            raise DatabaseError(f"Failed to store reflections: {e}") from e
+        except InvalidToken as e:
+            logger.error(f"Encryption error: {e}")
+            raise EncryptionError("Failed to encrypt reflections") from e
+
     def get_reflection(self, reflection_id: int) -> Optional[Tuple[str, str, str]]:
         """
         Retrieves and decrypts a specific reflection with integrity verification.
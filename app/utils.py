@@ -3,25 +3,86 @@ Utility functions and helpers for InnerBoard-local.
 Provides common functionality used across modules.
 """
 
-import re
 import json
-from typing import Any, Dict, List, Optional, Union, TypeVar, Callable
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union, TypeVar, Callable
+from collections import ChainMap
 from pathlib import Path
 from datetime import datetime
 import os
 import platform
-import uuid
-from functools import wraps
+import sys
+import time
+import secrets
+import string
+from functools import lru_cache, partial, wraps
 import hashlib
 
 from app.config import config
 from app.logging_config import get_logger
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; stdlib json is the fallback
+    orjson = None
+
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
 
+# orjson parses integers outside the 64-bit range as floats. Any input with a
+# run of 19+ digits could hold one, so it goes to stdlib json to stay exact.
+_LONG_DIGIT_RUN = re.compile("[0-9]{19}")
+
+
+def _json_loads(json_str: Any) -> Any:
+    """Parse JSON with orjson when it gives the same result as stdlib json."""
+    if orjson is not None and isinstance(json_str, str):
+        if _LONG_DIGIT_RUN.search(json_str) is None:
+            try:
+                return orjson.loads(json_str)
+            except orjson.JSONDecodeError:
+                # NaN, Infinity and out-of-range floats such as 1e400 are
+                # accepted by stdlib json; let it decide
+                pass
+    return json.loads(json_str)
+
+
+# Characters a JSON document can start with (including leading whitespace)
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI \t\r\n')
+
+_DEFAULT_TIMESTAMP_FMT = "%Y-%m-%d %H:%M:%S"
+
+_INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+_FILENAME_TRANS = str.maketrans(dict.fromkeys(_INVALID_FILENAME_CHARS, "_"))
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "._-")
+
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+
+_CSI_PARAM_CHARS = frozenset(string.digits + ";")
+_CSI_FINAL_CHARS = frozenset(string.ascii_letters)
+# C0 control characters and DEL, deleted via str.translate. The ones
+# str.splitlines() treats as line boundaries are kept so lines split as before.
+_LINE_BOUNDARY_CHARS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e")
+_CONTROL_CHARS_DELETE = dict.fromkeys(
+    c for c in [*range(0x20), 0x7F] if chr(c) not in _LINE_BOUNDARY_CHARS
+)
+
+_HASH_CTORS: Dict[str, Callable[..., Any]] = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+}
+_HASH_CHUNK_SIZE = 64 * 1024
+_HASH_JSON_ENCODER = json.JSONEncoder(default=str)
+
+# datetime.fromisoformat() only accepts a trailing "Z" from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
 def safe_json_loads(json_str: str, default: Any = None) -> Any:
     """
     Safely parse JSON string with fallback.
@@ -34,7 +95,7 @@ def safe_json_loads(json_str: str, default: Any = None) -> Any:
         Parsed JSON data or default value
     """
     try:
-        return json.loads(json_str)
+        return _json_loads(json_str)
     except (json.JSONDecodeError, TypeError) as e:
         logger.warning(f"Failed to parse JSON: {e}")
         return default
@@ -70,8 +131,11 @@ def sanitize_filename(filename: str, replacement: str = "_") -> str:
         Sanitized filename
     """
     # Remove or replace invalid characters
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, replacement, filename)
+    if replacement == "_":
+        table = _FILENAME_TRANS
+    else:
+        table = str.maketrans(dict.fromkeys(_INVALID_FILENAME_CHARS, replacement))
+    sanitized = filename.translate(table)
 
     # Remove leading/trailing dots and spaces
     sanitized = sanitized.strip(". ")
@@ -92,7 +156,7 @@ def sanitize_filename(filename: str, replacement: str = "_") -> str:
 
 
 def format_timestamp(
-    dt: Union[str, datetime, None], fmt: str = "%Y-%m-%d %H:%M:%S"
+    dt: Union[str, datetime, None], fmt: str = _DEFAULT_TIMESTAMP_FMT
 ) -> str:
     """
     Format timestamp for display.
@@ -104,21 +168,39 @@ def format_timestamp(
     Returns:
         Formatted timestamp string
     """
+    if isinstance(dt, datetime):
+        return dt.strftime(fmt)
+
     if dt is None:
         return "Unknown"
 
     if isinstance(dt, str):
-        try:
-            dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
-        except ValueError:
-            return dt  # Return as-is if parsing fails
-
-    if isinstance(dt, datetime):
-        return dt.strftime(fmt)
+        return _format_iso_timestamp(dt, fmt)
 
     return str(dt)
 
 
+@lru_cache(maxsize=256)
+def _format_iso_timestamp(iso: str, fmt: str) -> str:
+    """Parse and format an ISO-8601 string, memoized for repeated renders."""
+    try:
+        if _FROMISOFORMAT_ACCEPTS_Z:
+            parsed = datetime.fromisoformat(iso)
+        else:
+            parsed = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except ValueError:
+        return iso  # Return as-is if parsing fails
+    return parsed.strftime(fmt)
+
+
+def _get_hash_ctor(algorithm: str) -> Callable[..., Any]:
+    """Resolve a hash constructor, preferring hashlib's named fast paths."""
+    ctor = _HASH_CTORS.get(algorithm)
+    if ctor is None:
+        return partial(hashlib.new, algorithm)
+    return ctor
+
+
 def calculate_hash(data: Union[str, bytes], algorithm: str = "sha256") -> str:
     """
     Calculate hash of data.
@@ -133,11 +215,89 @@ def calculate_hash(data: Union[str, bytes], algorithm: str = "sha256") -> str:
     if isinstance(data, str):
         data = data.encode("utf-8")
 
-    hasher = hashlib.new(algorithm)
-    hasher.update(data)
+    return _get_hash_ctor(algorithm)(data).hexdigest()
+
+
+def calculate_hashes_batch(
+    items: List[Union[str, bytes]], algorithm: str = "sha256"
+) -> List[str]:
+    """
+    Calculate hashes for many items in one call.
+
+    The algorithm lookup happens once for the whole batch rather than per item.
+
+    Args:
+        items: Data items to hash
+        algorithm: Hash algorithm to use
+
+    Returns:
+        Hexadecimal hash strings, in the same order as items
+    """
+    ctor = _get_hash_ctor(algorithm)
+    encoded = [i.encode("utf-8") if isinstance(i, str) else i for i in items]
+    return [ctor(b).hexdigest() for b in encoded]
+
+
+def calculate_hash_iter(
+    chunks: Iterable[Union[str, bytes]], algorithm: str = "sha256"
+) -> str:
+    """
+    Calculate hash of the concatenation of chunks without joining them.
+
+    Args:
+        chunks: Data chunks to hash, in order
+        algorithm: Hash algorithm to use
+
+    Returns:
+        Hexadecimal hash string
+    """
+    hasher = _get_hash_ctor(algorithm)()
+    for chunk in chunks:
+        hasher.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
     return hasher.hexdigest()
 
 
+def calculate_hash_json(data: Any, algorithm: str = "sha256") -> str:
+    """
+    Calculate hash of data's JSON encoding.
+
+    The encoding matches json.dumps(data, default=str), with the default
+    ", " and ": " separators. It is streamed into the hasher, so the full
+    JSON string is never built.
+
+    Args:
+        data: JSON-serializable data (non-serializable values use str())
+        algorithm: Hash algorithm to use
+
+    Returns:
+        Hexadecimal hash string
+    """
+    return calculate_hash_iter(_HASH_JSON_ENCODER.iterencode(data), algorithm)
+
+
+def calculate_file_hash(
+    file_path: Union[str, Path], algorithm: str = "sha256"
+) -> str:
+    """
+    Calculate hash of a file's contents without loading it into memory.
+
+    Args:
+        file_path: Path to file
+        algorithm: Hash algorithm to use
+
+    Returns:
+        Hexadecimal hash string
+    """
+    with open(file_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, _get_hash_ctor(algorithm)).hexdigest()
+
+        hasher = _get_hash_ctor(algorithm)()
+        for chunk in iter(partial(f.read, _HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text to maximum length.
@@ -215,8 +375,6 @@ def retry_on_failure(
                             f"Attempt {attempt + 1} failed for {func.__name__}: {e}. "
                             f"Retrying in {current_delay}s..."
                         )
-                        import time
-
                         time.sleep(current_delay)
                         current_delay *= backoff
                     else:
@@ -241,8 +399,20 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    if not isinstance(email, str):
+        return False
+
+    local, _, domain = email.partition("@")
+    name, _, tld = domain.rpartition(".")
+    return (
+        bool(local)
+        and bool(name)
+        and len(tld) >= 2
+        and tld.isascii()
+        and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(name)
+    )
 
 
 def ensure_directory(path: Union[str, Path]) -> Path:
@@ -288,30 +458,58 @@ def is_valid_json(json_str: str) -> bool:
     Returns:
         True if valid JSON, False otherwise
     """
+    # Reject obviously non-JSON input without invoking the parser
+    if isinstance(json_str, str) and (
+        not json_str or json_str[0] not in _JSON_START_CHARS
+    ):
+        return False
+
     try:
-        json.loads(json_str)
+        _json_loads(json_str)
         return True
     except (json.JSONDecodeError, TypeError):
         return False
 
 
-def merge_dicts(*dicts: Dict[str, Any]) -> Dict[str, Any]:
+def merge_dicts(*dicts: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Merge multiple dictionaries.
 
+    Later dictionaries take precedence; ``None`` or empty entries are skipped.
+
     Args:
         *dicts: Dictionaries to merge
 
     Returns:
         Merged dictionary
     """
-    result = {}
+    if len(dicts) == 2:
+        # Common case: a single unpacking build, no Python-level loop
+        a, b = dicts
+        return {**(a or {}), **(b or {})}
+
+    result: Dict[str, Any] = {}
     for d in dicts:
         if d:
             result.update(d)
     return result
 
 
+def merge_dicts_view(*dicts: Optional[Dict[str, Any]]) -> Mapping[str, Any]:
+    """
+    Read-only merged view of multiple dictionaries without copying.
+
+    Lookup precedence matches merge_dicts (later dictionaries win).
+
+    Args:
+        *dicts: Dictionaries to merge
+
+    Returns:
+        ChainMap over the non-empty inputs
+    """
+    return ChainMap(*[d for d in reversed(dicts) if d])
+
+
 def deep_get(dictionary: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
     """
     Get nested dictionary value safely.
@@ -353,6 +551,32 @@ class Timer:
             logger.debug(f"{self.name} completed in {duration.total_seconds():.2f}s")
 
 
+def _strip_ansi_sequences(text: str) -> str:
+    """Remove ANSI CSI sequences (ESC [ params letter), jumping between ESCs."""
+    esc = text.find("\x1b")
+    if esc < 0:
+        return text
+
+    n = len(text)
+    pieces: List[str] = []
+    start = 0
+    while esc >= 0:
+        end = esc + 1
+        if end < n and text[end] == "[":
+            end += 1
+            while end < n and text[end] in _CSI_PARAM_CHARS:
+                end += 1
+            if end < n and text[end] in _CSI_FINAL_CHARS:
+                pieces.append(text[start:esc])
+                start = end + 1
+                esc = text.find("\x1b", start)
+                continue
+        # Not a complete sequence; the lone ESC is dropped later as a control char
+        esc = text.find("\x1b", esc + 1)
+    pieces.append(text[start:])
+    return "".join(pieces)
+
+
 def clean_terminal_log(log_content: str) -> str:
     """
     Clean terminal log by removing line numbers and ANSI escape codes.
@@ -361,27 +585,20 @@ def clean_terminal_log(log_content: str) -> str:
     Returns:
         Cleaned text.
     """
-    import re
-    from typing import List
-    lines = log_content.splitlines()
+    # Neither step touches line boundaries or "|", so both run once over the
+    # whole text instead of per line
+    text = _strip_ansi_sequences(log_content).translate(_CONTROL_CHARS_DELETE)
     cleaned_lines: List[str] = []
-    for line in lines:
-        if '|' in line:
-            parts = line.split('|', 1)
-            if len(parts) == 2:
-                content = parts[1]
-            else:
-                content = line
-        else:
-            content = line
-        content = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', content)
-        content = re.sub(r'[\x00-\x1f\x7f]', '', content)
+    for line in text.splitlines():
+        # Drop the "NNN|" line-number prefix when present
+        content = line.partition("|")[2] if "|" in line else line
         content = content.strip()
         if content:
             cleaned_lines.append(content)
-    return '\n'.join(cleaned_lines)
+    return "\n".join(cleaned_lines)
 
 
+@lru_cache(maxsize=None)
 def is_wsl() -> bool:
     """
     Detect if running inside Windows Subsystem for Linux.
@@ -395,10 +612,13 @@ def is_wsl() -> bool:
         return False
 
 
+@lru_cache(maxsize=None)
 def get_app_data_dir(app_name: str = "InnerBoard") -> Path:
     """
     Get the appropriate per-user application data directory for the OS.
 
+    The result is cached per app_name for the lifetime of the process.
+
     On Windows: %LOCALAPPDATA%\\{app_name}
     On macOS: ~/Library/{app_name} (no spaces for better CLI usability)
     On Linux: $XDG_DATA_HOME/{app_name} or ~/.local/share/{app_name}
@@ -427,10 +647,14 @@ def get_app_data_dir(app_name: str = "InnerBoard") -> Path:
     return base_path / app_name
 
 
+@lru_cache(maxsize=None)
 def get_sessions_dir(app_name: str = "InnerBoard") -> Path:
     """
     Get (and ensure) the sessions directory under the app data directory.
 
+    The result is cached per app_name, so the directory creation and any
+    legacy migration only run on the first call in a process.
+
     On macOS: ~/Library/{app_name}/sessions (no spaces for CLI usability)
     On Windows: %LOCALAPPDATA%\\{app_name}\\sessions
     On Linux: $XDG_DATA_HOME/{app_name}/sessions or ~/.local/share/{app_name}/sessions
@@ -479,6 +703,9 @@ def get_sessions_dir(app_name: str = "InnerBoard") -> Path:
     return new_sessions_dir
 
 
+_SESSION_HINT_ENV_KEYS = ("TERM_SESSION_ID", "SESSIONNAME", "SHELL", "WSL_DISTRO_NAME")
+
+
 def generate_session_filename(
     session_hint: Optional[str] = None, extension: str = "log"
 ) -> str:
@@ -494,20 +721,37 @@ def generate_session_filename(
     Returns:
         Filename string
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_id = uuid.uuid4().hex[:8]
+    t = time.localtime()
+    timestamp = (
+        f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_"
+        f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+    )
+    short_id = secrets.token_hex(4)
     hint = session_hint or _detect_session_hint()
     parts: List[str] = ["session", timestamp]
     if hint:
         parts.append(hint)
     parts.append(short_id)
     base = "_".join(parts)
-    filename = f"{base}.{extension.strip('.')}"
+    extension = extension.strip(".")
+    filename = f"{base}.{extension}"
+
+    # Only the hint and extension can introduce unsafe characters
+    if (
+        extension
+        and len(filename) <= 255
+        and _SAFE_FILENAME_CHARS.issuperset(filename)
+    ):
+        return filename
     return sanitize_filename(filename)
 
 
+@lru_cache(maxsize=1)
 def _detect_session_hint() -> str:
-    """Best-effort detection of a useful session hint for filenames."""
+    """Best-effort detection of a useful session hint for filenames.
+
+    Cached: the tty and environment are fixed for the life of the process.
+    """
     # Try tty name
     try:
         tty = os.ttyname(0)
@@ -517,10 +761,11 @@ def _detect_session_hint() -> str:
         pass
 
     # Environment hints
-    for env_key in ("TERM_SESSION_ID", "SESSIONNAME", "SHELL", "WSL_DISTRO_NAME"):
-        val = os.getenv(env_key)
+    environ = os.environ
+    for env_key in _SESSION_HINT_ENV_KEYS:
+        val = environ.get(env_key)
         if val:
-            return Path(str(val)).name
+            return Path(val).name
 
     # Process ID fallback
     try:
@@ -584,8 +829,6 @@ def main():
     # Test timer
     print("\n5. Timer:")
     with Timer("Demo operation"):
-        import time
-
         time.sleep(0.1)
         print("  Performing some work...")
 
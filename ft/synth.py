@@ -1,7 +1,7 @@
 """
 Generate synthetic training data for finetuning:
-- pairs.jsonl: {"input": <raw transcript>, "output": <strict JSON>}
-- trl_messages.jsonl: {"messages": [developer, user, assistant]}
+- pairs.jsonl.gz: {"input": <raw transcript>, "output": <strict JSON>}
+- harmony_messages.jsonl.gz: {"messages": [developer, user, assistant]}
 
 The schema for the JSON output:
 {
@@ -15,11 +15,20 @@ The schema for the JSON output:
 import json
 import random
 import textwrap
-import datetime
+import calendar
+import gzip
 import os
 import re
+import time
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSONL serialization
+    orjson = None
+
 random.seed(7)
 
 SCHEMA_TEXT = textwrap.dedent("""\
@@ -47,40 +56,138 @@ Schema:
 ]
 """)
 
+# ANSI/OSC sequences esc() sprinkles into transcripts
+_NOISE = (
+    "\x1b[0m", "\x1b[38;5;242m", "\x1b[49m", "\x1b]2;title\x07", "\x1b]1;tab\x07",
+    "\x1b[?2004h", "\x1b[?2004l", "\x1b[?25l", "\x1b[?25h"
+)
+_NOISE_N = len(_NOISE)
+
+# One uniform draw per line picks among the four independent prefix (p=0.25) /
+# suffix (p=0.15) outcomes. Cumulative bounds for cases 0 none, 1 prefix only,
+# 2 suffix only, 3 both; bit 0 = prefix, bit 1 = suffix.
+_NOISE_CASE_BOUNDS = (0.75 * 0.85, 0.85, 0.85 + 0.75 * 0.15)
+_NOISE_CASE_PICKS = (0, 1, 1, 2)  # noise strings needed per case
+
+def _plan_noise(allowed, noise_n):
+    """Pick the noise index (or -1 for none) to prepend/append to each line
+
+    allowed holds a per-line case bitmask (see _split_for_noise).
+    """
+    n = len(allowed)
+    rand = random.random
+    bounds = _NOISE_CASE_BOUNDS
+    # Blank lines are never decorated, so they draw nothing
+    cases = [bisect_right(bounds, rand()) & a if a else 0 for a in allowed]
+    # All noise indices for the transcript in one batched draw
+    picks = random.choices(range(noise_n), k=sum(_NOISE_CASE_PICKS[c] for c in cases))
+    pre = [-1] * n
+    post = [-1] * n
+    p = 0
+    for k in range(n):
+        case = cases[k]
+        if not case:
+            continue
+        if case & 1:
+            pre[k] = picks[p]
+            p += 1
+        if case & 2:
+            post[k] = picks[p]
+            p += 1
+    return pre, post
+
+# Lines that already open with a CSI/OSC sequence don't get another prefix
+_STARTS_WITH_ESC = re.compile(r"\x1b[\[\]]")
+
+@lru_cache(maxsize=1024)
+def _split_for_noise(s):
+    """Split s into lines with the noise cases allowed for each, cached per input
+
+    Blank lines allow nothing (0), lines already starting with an escape
+    sequence allow only a suffix (2), all others allow both (3).
+    """
+    chunks = tuple(s.split("\n"))
+    starts_with_esc = _STARTS_WITH_ESC.match
+    allowed = tuple(
+        0 if not line.strip() else 2 if starts_with_esc(line) else 3
+        for line in chunks
+    )
+    return chunks, allowed
+
 def esc(s):
     """Sprinkle some ANSI/OSC noise to simulate 'script' logs"""
-    noise = [
-        "\x1b[0m", "\x1b[38;5;242m", "\x1b[49m", "\x1b]2;title\x07", "\x1b]1;tab\x07",
-        "\x1b[?2004h", "\x1b[?2004l", "\x1b[?25l", "\x1b[?25h"
-    ]
-    chunks = s.split("\n")
-    out = []
-    for line in chunks:
-        if not line.strip():
-            out.append(line)
-            continue
-        if random.random() < 0.25:
-            line = noise[random.randrange(len(noise))] + line
-        if random.random() < 0.15:
-            line = line + noise[random.randrange(len(noise))]
-        out.append(line)
+    noise = _NOISE
+    # Single blank line: nothing to decorate, skip the split and RNG work
+    if "\n" not in s and not s.strip():
+        return s
+
+    chunks, allowed = _split_for_noise(s)
+    pre, post = _plan_noise(allowed, _NOISE_N)
+    n = len(chunks)
+    out = [None] * n
+    for k in range(n):
+        line = chunks[k]
+        if pre[k] >= 0:
+            line = noise[pre[k]] + line
+        if post[k] >= 0:
+            line = line + noise[post[k]]
+        out[k] = line
     return "\n".join(out)
 
+# nowstamp() base time as UTC epoch seconds, plus "%a"/"%b" names (C locale)
+_STAMP_BASE_EPOCH = calendar.timegm((2025, 9, 6, 0, 3, 10))
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+@lru_cache(maxsize=4096)
+def _format_stamp(offset_sec):
+    """Format the base time plus offset_sec, cached per offset"""
+    t = time.gmtime(_STAMP_BASE_EPOCH + offset_sec)
+    # Same layout as strftime("%a %b %d %H:%M:%S %Y"), without the strftime call
+    return (
+        f"{_WEEKDAYS[t.tm_wday]} {_MONTHS[t.tm_mon - 1]} {t.tm_mday:02d} "
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d} {t.tm_year}"
+    )
+
 def nowstamp(offset_min=0):
     """Generate timestamp for script logs"""
-    base = datetime.datetime(2025, 9, 6, 0, 3, 10)
-    t = base + datetime.timedelta(minutes=offset_min, seconds=random.randint(0, 40))
-    return t.strftime("%a %b %d %H:%M:%S %Y")
+    # The jitter is drawn per call; only the formatting is memoized
+    return _format_stamp(offset_min * 60 + random.randint(0, 40))
+
+_DEV_PROMPT = (
+    "You convert terminal transcripts into status reports.\n"
+    "Respond with STRICT JSON only, matching the provided schema exactly.\n"
+    "Do not include code fences, comments, or extra text."
+)
+_USER_PROMPT_PREFIX = SCHEMA_TEXT + "\nTranscript:\n"
 
 def mk_prompt(transcript):
     """Create developer and user prompts for the conversation"""
-    dev = (
-        "You convert terminal transcripts into status reports.\n"
-        "Respond with STRICT JSON only, matching the provided schema exactly.\n"
-        "Do not include code fences, comments, or extra text."
-    )
-    user = f"{SCHEMA_TEXT}\nTranscript:\n{transcript}"
-    return dev, user
+    return _DEV_PROMPT, _USER_PROMPT_PREFIX + transcript
+
+# UTF-8 encoded developer prompt + separator + user prefix, for byte consumers
+_PROMPT_BYTES_PREFIX = (_DEV_PROMPT + "\n" + _USER_PROMPT_PREFIX).encode("utf-8")
+
+def mk_prompt_bytes(transcript):
+    """Developer and user prompts joined by a newline, as UTF-8 bytes
+
+    Only the transcript is encoded per call; the constant prefix is encoded once.
+    """
+    return b"".join((_PROMPT_BYTES_PREFIX, transcript.encode("utf-8")))
+
+def success(desc, specifics, adjacent_context):
+    """Create a key_successes entry"""
+    return {"desc": desc, "specifics": specifics, "adjacent_context": adjacent_context}
+
+def blocker(desc, impact, owner_hint, resolution_hint):
+    """Create a blockers entry"""
+    return {
+        "desc": desc,
+        "impact": impact,
+        "owner_hint": owner_hint,
+        "resolution_hint": resolution_hint
+    }
 
 def json_obj(summary, successes, blockers, resources):
     """Create the expected JSON output structure"""
@@ -92,10 +199,12 @@ def json_obj(summary, successes, blockers, resources):
     }]
 
 # Scenario builders
-def scen_py_tests_ok():
-    """Scenario: Python tests pass successfully"""
-    ts = nowstamp(0)
-    transcript = f"""Script started on {ts}
+# Transcripts are module-level templates. Noise is applied to the template
+# (whose split esc() caches) and only then is the timestamp filled in; the
+# noise strings contain no braces, so str.format is unaffected.
+# Expected outputs are built once and shared by every call, so treat them as
+# read-only (copy.deepcopy before mutating).
+_PY_TESTS_OK_TRANSCRIPT = """Script started on {ts}
 ~/repo │ on main ▓▒░ base Py │ 3.11.8 ─╮
 ❯ python --version
 Python 3.11.8
@@ -107,23 +216,25 @@ black..............................................Passed
 ruff...............................................Passed
 mypy...............................................Passed
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Ran local test suite and linters successfully on main",
-        [{
-            "desc": "All tests and linters passed",
-            "specifics": "pytest -q; pre-commit (black, ruff, mypy)",
-            "adjacent_context": "120 passed, 3 skipped in ~48s on branch main"
-        }],
-        [],
-        ["Merge PR after CI mirrors this result", "Tag the commit if release-ready"]
-    )
-    return transcript, out
 
-def scen_docker_eof():
-    """Scenario: Docker build fails with EOF"""
-    ts = nowstamp(5)
-    transcript = f"""Script started on {ts}
+_PY_TESTS_OK_OUT = json_obj(
+    "Ran local test suite and linters successfully on main",
+    [success(
+        desc="All tests and linters passed",
+        specifics="pytest -q; pre-commit (black, ruff, mypy)",
+        adjacent_context="120 passed, 3 skipped in ~48s on branch main"
+    )],
+    [],
+    ["Merge PR after CI mirrors this result", "Tag the commit if release-ready"]
+)
+
+def scen_py_tests_ok():
+    """Scenario: Python tests pass successfully"""
+    ts = nowstamp(0)
+    transcript = esc(_PY_TESTS_OK_TRANSCRIPT).format(ts=ts)
+    return transcript, _PY_TESTS_OK_OUT
+
+_DOCKER_EOF_TRANSCRIPT = """Script started on {ts}
 ~/app │ on feature/dockerize ▓▒░ base Py │ 3.12.6 ─╮
 ❯ docker --version
 Docker version 27.0.3, build abcdefg
@@ -138,28 +249,30 @@ Docker version 27.0.3, build abcdefg
  => CANCELED
 error: unexpected EOF
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Attempted Docker image build; build aborted with unexpected EOF",
-        [{
-            "desc": "Validated Docker environment version",
-            "specifics": "Docker 27.0.3; began multi-stage build",
-            "adjacent_context": "Canceled at layer [4/9] pip install"
-        }],
-        [{
-            "desc": "Docker build failed with 'unexpected EOF'",
-            "impact": "Image cannot be produced; deploy pipeline blocked",
-            "owner_hint": "Infra or DevOps",
-            "resolution_hint": "Retry with --no-cache; inspect network, registry creds, or COPY context size"
-        }],
-        ["Re-run: docker build --no-cache .", "Check Docker daemon logs", "Validate registry login (docker login)"]
-    )
-    return transcript, out
 
-def scen_git_conflict():
-    """Scenario: Git merge conflict"""
-    ts = nowstamp(12)
-    transcript = f"""Script started on {ts}
+_DOCKER_EOF_OUT = json_obj(
+    "Attempted Docker image build; build aborted with unexpected EOF",
+    [success(
+        desc="Validated Docker environment version",
+        specifics="Docker 27.0.3; began multi-stage build",
+        adjacent_context="Canceled at layer [4/9] pip install"
+    )],
+    [blocker(
+        desc="Docker build failed with 'unexpected EOF'",
+        impact="Image cannot be produced; deploy pipeline blocked",
+        owner_hint="Infra or DevOps",
+        resolution_hint="Retry with --no-cache; inspect network, registry creds, or COPY context size"
+    )],
+    ["Re-run: docker build --no-cache .", "Check Docker daemon logs", "Validate registry login (docker login)"]
+)
+
+def scen_docker_eof():
+    """Scenario: Docker build fails with EOF"""
+    ts = nowstamp(5)
+    transcript = esc(_DOCKER_EOF_TRANSCRIPT).format(ts=ts)
+    return transcript, _DOCKER_EOF_OUT
+
+_GIT_CONFLICT_TRANSCRIPT = """Script started on {ts}
 ~/service │ on feature/refactor-auth ▓▒░
 ❯ git pull origin main
 From github.com:org/service
@@ -172,28 +285,30 @@ On branch feature/refactor-auth
 You have unmerged paths.
   (fix conflicts and run "git commit")
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Pulled latest main; encountered merge conflict in auth module",
-        [{
-            "desc": "Fetched latest changes from main",
-            "specifics": "git pull origin main",
-            "adjacent_context": "Conflict in auth/handlers.py"
-        }],
-        [{
-            "desc": "Merge conflict blocks integration",
-            "impact": "Feature branch cannot be merged until resolved",
-            "owner_hint": "Author of feature branch",
-            "resolution_hint": "Manual resolve in auth/handlers.py; run tests; commit merge"
-        }],
-        ["Open file diff tool", "Coordinate with auth codeowner for intended logic"]
-    )
-    return transcript, out
 
-def scen_node_audit():
-    """Scenario: Node.js build with security vulnerabilities"""
-    ts = nowstamp(20)
-    transcript = f"""Script started on {ts}
+_GIT_CONFLICT_OUT = json_obj(
+    "Pulled latest main; encountered merge conflict in auth module",
+    [success(
+        desc="Fetched latest changes from main",
+        specifics="git pull origin main",
+        adjacent_context="Conflict in auth/handlers.py"
+    )],
+    [blocker(
+        desc="Merge conflict blocks integration",
+        impact="Feature branch cannot be merged until resolved",
+        owner_hint="Author of feature branch",
+        resolution_hint="Manual resolve in auth/handlers.py; run tests; commit merge"
+    )],
+    ["Open file diff tool", "Coordinate with auth codeowner for intended logic"]
+)
+
+def scen_git_conflict():
+    """Scenario: Git merge conflict"""
+    ts = nowstamp(12)
+    transcript = esc(_GIT_CONFLICT_TRANSCRIPT).format(ts=ts)
+    return transcript, _GIT_CONFLICT_OUT
+
+_NODE_AUDIT_TRANSCRIPT = """Script started on {ts}
 ~/web │ on main ▓▒░ node v20.11 ─╮
 ❯ node -v
 v20.11.1
@@ -206,28 +321,30 @@ vite v5.1.0 building for production...
 dist/assets/index.abc123.js   210.45 kB
 build completed in 12.21s.
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Installed front-end deps; build succeeded; audit reports 3 vulnerabilities",
-        [{
-            "desc": "Front-end assets built successfully",
-            "specifics": "npm ci; npm run build (Vite)",
-            "adjacent_context": "402 modules transformed; bundle ~210 kB"
-        }],
-        [{
-            "desc": "Security vulnerabilities reported by npm audit",
-            "impact": "Potential security risk if deployed without patching",
-            "owner_hint": "Front-end team",
-            "resolution_hint": "Run `npm audit fix` or upgrade affected deps; consider pinned versions"
-        }],
-        ["Run: npm audit --production", "Schedule dependency upgrades next sprint"]
-    )
-    return transcript, out
 
-def scen_db_migration_fail():
-    """Scenario: Database migration failure"""
-    ts = nowstamp(28)
-    transcript = f"""Script started on {ts}
+_NODE_AUDIT_OUT = json_obj(
+    "Installed front-end deps; build succeeded; audit reports 3 vulnerabilities",
+    [success(
+        desc="Front-end assets built successfully",
+        specifics="npm ci; npm run build (Vite)",
+        adjacent_context="402 modules transformed; bundle ~210 kB"
+    )],
+    [blocker(
+        desc="Security vulnerabilities reported by npm audit",
+        impact="Potential security risk if deployed without patching",
+        owner_hint="Front-end team",
+        resolution_hint="Run `npm audit fix` or upgrade affected deps; consider pinned versions"
+    )],
+    ["Run: npm audit --production", "Schedule dependency upgrades next sprint"]
+)
+
+def scen_node_audit():
+    """Scenario: Node.js build with security vulnerabilities"""
+    ts = nowstamp(20)
+    transcript = esc(_NODE_AUDIT_TRANSCRIPT).format(ts=ts)
+    return transcript, _NODE_AUDIT_OUT
+
+_DB_MIGRATION_FAIL_TRANSCRIPT = """Script started on {ts}
 ~/api │ on main ▓▒░ ─╮
 ❯ poetry run alembic upgrade head
 INFO  [alembic.runtime.migration] Context impl PostgresqlImpl.
@@ -235,82 +352,88 @@ INFO  [alembic.runtime.migration] Will assume transactional DDL.
 ERROR [alembic.util.messaging] Can't locate revision identified by '3f2c0a1e9c5'
   FAILED: Can't locate revision '3f2c0a1e9c5'
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Attempted DB migration; missing revision error halted upgrade",
-        [{
-            "desc": "Verified alembic tooling on project",
-            "specifics": "alembic upgrade head invoked under poetry",
-            "adjacent_context": "Target revision '3f2c0a1e9c5' not found"
-        }],
-        [{
-            "desc": "Alembic revision missing",
-            "impact": "Cannot migrate DB; API deploy blocked",
-            "owner_hint": "Backend team / DB owners",
-            "resolution_hint": "Ensure migration file exists and is pushed; rebase and re-run"
-        }],
-        ["git fetch --all; check versions/ migration folder", "Coordinate migration order with teammates"]
-    )
-    return transcript, out
 
-def scen_k8s_apply_perm():
-    """Scenario: Kubernetes RBAC permission denied"""
-    ts = nowstamp(35)
-    transcript = f"""Script started on {ts}
+_DB_MIGRATION_FAIL_OUT = json_obj(
+    "Attempted DB migration; missing revision error halted upgrade",
+    [success(
+        desc="Verified alembic tooling on project",
+        specifics="alembic upgrade head invoked under poetry",
+        adjacent_context="Target revision '3f2c0a1e9c5' not found"
+    )],
+    [blocker(
+        desc="Alembic revision missing",
+        impact="Cannot migrate DB; API deploy blocked",
+        owner_hint="Backend team / DB owners",
+        resolution_hint="Ensure migration file exists and is pushed; rebase and re-run"
+    )],
+    ["git fetch --all; check versions/ migration folder", "Coordinate migration order with teammates"]
+)
+
+def scen_db_migration_fail():
+    """Scenario: Database migration failure"""
+    ts = nowstamp(28)
+    transcript = esc(_DB_MIGRATION_FAIL_TRANSCRIPT).format(ts=ts)
+    return transcript, _DB_MIGRATION_FAIL_OUT
+
+_K8S_APPLY_PERM_TRANSCRIPT = """Script started on {ts}
 ~/ops │ on main ▓▒░ ─╮
 ❯ kubectl apply -f deploy.yaml -n staging
 Error from server (Forbidden): error when retrieving current configuration:
 User "ci-bot" cannot get resource "deployments" in API group "apps" in the namespace "staging"
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Kubernetes apply failed due to RBAC permissions on staging",
-        [{
-            "desc": "Attempted to apply deployment manifest",
-            "specifics": "kubectl apply -f deploy.yaml -n staging",
-            "adjacent_context": "Service account ci-bot lacks get perms on deployments"
-        }],
-        [{
-            "desc": "RBAC forbids deployment retrieval",
-            "impact": "Cannot update staging; release halted",
-            "owner_hint": "Platform / SRE",
-            "resolution_hint": "Grant role with get/list/update on deployments in staging"
-        }],
-        ["Open RBAC ticket with exact error", "Temporarily run apply using an admin SA (if policy allows)"]
-    )
-    return transcript, out
 
-def scen_port_in_use():
-    """Scenario: Port already in use"""
-    ts = nowstamp(42)
-    transcript = f"""Script started on {ts}
+_K8S_APPLY_PERM_OUT = json_obj(
+    "Kubernetes apply failed due to RBAC permissions on staging",
+    [success(
+        desc="Attempted to apply deployment manifest",
+        specifics="kubectl apply -f deploy.yaml -n staging",
+        adjacent_context="Service account ci-bot lacks get perms on deployments"
+    )],
+    [blocker(
+        desc="RBAC forbids deployment retrieval",
+        impact="Cannot update staging; release halted",
+        owner_hint="Platform / SRE",
+        resolution_hint="Grant role with get/list/update on deployments in staging"
+    )],
+    ["Open RBAC ticket with exact error", "Temporarily run apply using an admin SA (if policy allows)"]
+)
+
+def scen_k8s_apply_perm():
+    """Scenario: Kubernetes RBAC permission denied"""
+    ts = nowstamp(35)
+    transcript = esc(_K8S_APPLY_PERM_TRANSCRIPT).format(ts=ts)
+    return transcript, _K8S_APPLY_PERM_OUT
+
+_PORT_IN_USE_TRANSCRIPT = """Script started on {ts}
 ~/svc │ on main ▓▒░ ─╮
 ❯ uvicorn app.main:app --reload --port 8000
 INFO:     Will watch for changes in these directories: ['/Users/dev/svc']
 ERROR:    [Errno 48] Address already in use
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Tried to start dev server; port 8000 already in use",
-        [{
-            "desc": "Detected running instance on port 8000",
-            "specifics": "uvicorn app.main:app --reload --port 8000",
-            "adjacent_context": "macOS errno 48"
-        }],
-        [{
-            "desc": "Port conflict",
-            "impact": "Local testing blocked",
-            "owner_hint": "Developer local env",
-            "resolution_hint": "Kill process using port, or start on alternative port"
-        }],
-        ["Run: lsof -i :8000 | awk 'NR>1{print $2}' | xargs kill -9", "Use --port 8001 temporarily"]
-    )
-    return transcript, out
 
-def scen_py_version_mismatch():
-    """Scenario: Python version incompatibility"""
-    ts = nowstamp(50)
-    transcript = f"""Script started on {ts}
+_PORT_IN_USE_OUT = json_obj(
+    "Tried to start dev server; port 8000 already in use",
+    [success(
+        desc="Detected running instance on port 8000",
+        specifics="uvicorn app.main:app --reload --port 8000",
+        adjacent_context="macOS errno 48"
+    )],
+    [blocker(
+        desc="Port conflict",
+        impact="Local testing blocked",
+        owner_hint="Developer local env",
+        resolution_hint="Kill process using port, or start on alternative port"
+    )],
+    ["Run: lsof -i :8000 | awk 'NR>1{print $2}' | xargs kill -9", "Use --port 8001 temporarily"]
+)
+
+def scen_port_in_use():
+    """Scenario: Port already in use"""
+    ts = nowstamp(42)
+    transcript = esc(_PORT_IN_USE_TRANSCRIPT).format(ts=ts)
+    return transcript, _PORT_IN_USE_OUT
+
+_PY_VERSION_MISMATCH_TRANSCRIPT = """Script started on {ts}
 ~/tooling │ on main ▓▒░ ─╮
 ❯ pyenv local 3.12.6
 ❯ python --version
@@ -318,28 +441,30 @@ Python 3.12.6
 ❯ pip install -e .
 ERROR: This package requires Python >=3.10,<3.12, but the running Python is 3.12.6
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Attempted editable install; package rejects Python 3.12",
-        [{
-            "desc": "Verified interpreter version via pyenv",
-            "specifics": "pyenv local 3.12.6; python --version",
-            "adjacent_context": "Package requires <3.12"
-        }],
-        [{
-            "desc": "Interpreter version unsupported by package",
-            "impact": "Local dev install fails",
-            "owner_hint": "Maintainer of package constraints",
-            "resolution_hint": "Switch to 3.11.x or relax classifiers and test"
-        }],
-        ["pyenv shell 3.11.9 && pip install -e .", "Run test matrix for 3.12 support"]
-    )
-    return transcript, out
 
-def scen_ci_green():
-    """Scenario: CI passes and release tag created"""
-    ts = nowstamp(58)
-    transcript = f"""Script started on {ts}
+_PY_VERSION_MISMATCH_OUT = json_obj(
+    "Attempted editable install; package rejects Python 3.12",
+    [success(
+        desc="Verified interpreter version via pyenv",
+        specifics="pyenv local 3.12.6; python --version",
+        adjacent_context="Package requires <3.12"
+    )],
+    [blocker(
+        desc="Interpreter version unsupported by package",
+        impact="Local dev install fails",
+        owner_hint="Maintainer of package constraints",
+        resolution_hint="Switch to 3.11.x or relax classifiers and test"
+    )],
+    ["pyenv shell 3.11.9 && pip install -e .", "Run test matrix for 3.12 support"]
+)
+
+def scen_py_version_mismatch():
+    """Scenario: Python version incompatibility"""
+    ts = nowstamp(50)
+    transcript = esc(_PY_VERSION_MISMATCH_TRANSCRIPT).format(ts=ts)
+    return transcript, _PY_VERSION_MISMATCH_OUT
+
+_CI_GREEN_TRANSCRIPT = """Script started on {ts}
 ~/repo │ on main ▓▒░ ─╮
 ❯ gh run watch --exit-status
 ✓ Build
@@ -348,27 +473,29 @@ def scen_ci_green():
 All checks passed
 ❯ git tag v1.4.0 && git push origin v1.4.0
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "CI pipeline green; created and pushed v1.4.0 tag",
-        [{
-            "desc": "All CI checks passing",
-            "specifics": "gh run watch --exit-status",
-            "adjacent_context": "Build/Test/Lint ✓ on main"
-        }, {
-            "desc": "Release tag created",
-            "specifics": "git tag v1.4.0 && git push origin v1.4.0",
-            "adjacent_context": "Version v1.4.0"
-        }],
-        [],
-        ["Publish release notes", "Promote to staging"]
-    )
-    return transcript, out
 
-def scen_ollama_version_check():
-    """Scenario: Checking Ollama and Python versions"""
-    ts = nowstamp(65)
-    transcript = f"""Script started on {ts}
+_CI_GREEN_OUT = json_obj(
+    "CI pipeline green; created and pushed v1.4.0 tag",
+    [success(
+        desc="All CI checks passing",
+        specifics="gh run watch --exit-status",
+        adjacent_context="Build/Test/Lint ✓ on main"
+    ), success(
+        desc="Release tag created",
+        specifics="git tag v1.4.0 && git push origin v1.4.0",
+        adjacent_context="Version v1.4.0"
+    )],
+    [],
+    ["Publish release notes", "Promote to staging"]
+)
+
+def scen_ci_green():
+    """Scenario: CI passes and release tag created"""
+    ts = nowstamp(58)
+    transcript = esc(_CI_GREEN_TRANSCRIPT).format(ts=ts)
+    return transcript, _CI_GREEN_OUT
+
+_OLLAMA_VERSION_CHECK_TRANSCRIPT = """Script started on {ts}
 ~/Documents/GitHub/InnerBoard-local │ on main !10 ?7 ▓▒░ base Py │ 3.12.6 ─╮
 ❯ python --version
 Python 3.12.6
@@ -382,27 +509,29 @@ Python 3.12.6 (main, Nov 22 2024, 20:50:01) [Clang 15.0.0 (clang-1500.3.9.4)] on
 Type "help", "copyright", "credits" or "license" for more information.
 >>> exit()
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Verified Python 3.12.6 and Ollama 0.11.8 environment versions",
-        [{
-            "desc": "Confirmed Python interpreter version",
-            "specifics": "python --version; python -v interactive session",
-            "adjacent_context": "Python 3.12.6 on Darwin with Clang 15.0.0"
-        }, {
-            "desc": "Verified Ollama installation",
-            "specifics": "ollama --version",
-            "adjacent_context": "Version 0.11.8 installed"
-        }],
-        [],
-        ["Document runtime requirements in README", "Consider pinning versions in pyproject.toml"]
-    )
-    return transcript, out
 
-def scen_terraform_plan():
-    """Scenario: Terraform infrastructure planning"""
-    ts = nowstamp(70)
-    transcript = f"""Script started on {ts}
+_OLLAMA_VERSION_CHECK_OUT = json_obj(
+    "Verified Python 3.12.6 and Ollama 0.11.8 environment versions",
+    [success(
+        desc="Confirmed Python interpreter version",
+        specifics="python --version; python -v interactive session",
+        adjacent_context="Python 3.12.6 on Darwin with Clang 15.0.0"
+    ), success(
+        desc="Verified Ollama installation",
+        specifics="ollama --version",
+        adjacent_context="Version 0.11.8 installed"
+    )],
+    [],
+    ["Document runtime requirements in README", "Consider pinning versions in pyproject.toml"]
+)
+
+def scen_ollama_version_check():
+    """Scenario: Checking Ollama and Python versions"""
+    ts = nowstamp(65)
+    transcript = esc(_OLLAMA_VERSION_CHECK_TRANSCRIPT).format(ts=ts)
+    return transcript, _OLLAMA_VERSION_CHECK_OUT
+
+_TERRAFORM_PLAN_TRANSCRIPT = """Script started on {ts}
 ~/infra │ on feature/add-monitoring ▓▒░ ─╮
 ❯ terraform --version
 Terraform v1.5.7
@@ -419,23 +548,25 @@ Terraform will perform the following actions:
 
 Plan: 1 to add, 0 to change, 0 to destroy.
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Planned Terraform infrastructure changes for monitoring setup",
-        [{
-            "desc": "Terraform plan executed successfully",
-            "specifics": "terraform plan on feature/add-monitoring branch",
-            "adjacent_context": "1 resource to add (CloudWatch log group), 14-day retention"
-        }],
-        [],
-        ["Review plan with team before apply", "Consider longer retention for production logs"]
-    )
-    return transcript, out
 
-def scen_redis_connection_fail():
-    """Scenario: Redis connection failure during development"""
-    ts = nowstamp(75)
-    transcript = f"""Script started on {ts}
+_TERRAFORM_PLAN_OUT = json_obj(
+    "Planned Terraform infrastructure changes for monitoring setup",
+    [success(
+        desc="Terraform plan executed successfully",
+        specifics="terraform plan on feature/add-monitoring branch",
+        adjacent_context="1 resource to add (CloudWatch log group), 14-day retention"
+    )],
+    [],
+    ["Review plan with team before apply", "Consider longer retention for production logs"]
+)
+
+def scen_terraform_plan():
+    """Scenario: Terraform infrastructure planning"""
+    ts = nowstamp(70)
+    transcript = esc(_TERRAFORM_PLAN_TRANSCRIPT).format(ts=ts)
+    return transcript, _TERRAFORM_PLAN_OUT
+
+_REDIS_CONNECTION_FAIL_TRANSCRIPT = """Script started on {ts}
 ~/api │ on main ▓▒░ ─╮
 ❯ redis-cli ping
 Could not connect to Redis at 127.0.0.1:6379: Connection refused
@@ -446,28 +577,30 @@ redis                    stopped
 ❯ redis-cli ping
 PONG
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Redis service was down; restarted successfully",
-        [{
-            "desc": "Redis service restarted via Homebrew",
-            "specifics": "brew services start redis; redis-cli ping returned PONG",
-            "adjacent_context": "Local Redis on port 6379"
-        }],
-        [{
-            "desc": "Redis connection initially failed",
-            "impact": "Local development blocked until service restart",
-            "owner_hint": "Developer environment",
-            "resolution_hint": "Check Redis service status and restart if needed"
-        }],
-        ["Add Redis health check to dev setup script", "Document Redis as development dependency"]
-    )
-    return transcript, out
 
-def scen_webpack_build_slow():
-    """Scenario: Webpack build performance issues"""
-    ts = nowstamp(80)
-    transcript = f"""Script started on {ts}
+_REDIS_CONNECTION_FAIL_OUT = json_obj(
+    "Redis service was down; restarted successfully",
+    [success(
+        desc="Redis service restarted via Homebrew",
+        specifics="brew services start redis; redis-cli ping returned PONG",
+        adjacent_context="Local Redis on port 6379"
+    )],
+    [blocker(
+        desc="Redis connection initially failed",
+        impact="Local development blocked until service restart",
+        owner_hint="Developer environment",
+        resolution_hint="Check Redis service status and restart if needed"
+    )],
+    ["Add Redis health check to dev setup script", "Document Redis as development dependency"]
+)
+
+def scen_redis_connection_fail():
+    """Scenario: Redis connection failure during development"""
+    ts = nowstamp(75)
+    transcript = esc(_REDIS_CONNECTION_FAIL_TRANSCRIPT).format(ts=ts)
+    return transcript, _REDIS_CONNECTION_FAIL_OUT
+
+_WEBPACK_BUILD_SLOW_TRANSCRIPT = """Script started on {ts}
 ~/frontend │ on main ▓▒░ node v18.17 ─╮
 ❯ npm run build
 > frontend@1.0.0 build
@@ -480,28 +613,30 @@ webpack 5.88.2 compiled successfully in 47382 ms
 Bundle size: 2.1MB (too large!)
 Largest chunks: lodash (400KB), moment (350KB), unused deps (300KB)
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Webpack build successful but bundle size too large at 2.1MB",
-        [{
-            "desc": "Production build completed successfully",
-            "specifics": "webpack --mode production in 47.3s",
-            "adjacent_context": "Main bundle 2.1MB, CSS 45.2KB"
-        }],
-        [{
-            "desc": "Bundle size exceeds performance budget",
-            "impact": "Slow page load times affecting user experience",
-            "owner_hint": "Frontend team",
-            "resolution_hint": "Remove unused dependencies, implement code splitting, tree shaking"
-        }],
-        ["Replace moment.js with date-fns", "Implement dynamic imports for large libraries", "Run bundle analyzer regularly"]
-    )
-    return transcript, out
 
-def scen_mysql_migration():
-    """Scenario: Database migration execution"""
-    ts = nowstamp(85)
-    transcript = f"""Script started on {ts}
+_WEBPACK_BUILD_SLOW_OUT = json_obj(
+    "Webpack build successful but bundle size too large at 2.1MB",
+    [success(
+        desc="Production build completed successfully",
+        specifics="webpack --mode production in 47.3s",
+        adjacent_context="Main bundle 2.1MB, CSS 45.2KB"
+    )],
+    [blocker(
+        desc="Bundle size exceeds performance budget",
+        impact="Slow page load times affecting user experience",
+        owner_hint="Frontend team",
+        resolution_hint="Remove unused dependencies, implement code splitting, tree shaking"
+    )],
+    ["Replace moment.js with date-fns", "Implement dynamic imports for large libraries", "Run bundle analyzer regularly"]
+)
+
+def scen_webpack_build_slow():
+    """Scenario: Webpack build performance issues"""
+    ts = nowstamp(80)
+    transcript = esc(_WEBPACK_BUILD_SLOW_TRANSCRIPT).format(ts=ts)
+    return transcript, _WEBPACK_BUILD_SLOW_OUT
+
+_MYSQL_MIGRATION_TRANSCRIPT = """Script started on {ts}
 ~/backend │ on main ▓▒░ ─╮
 ❯ php artisan migrate:status
 +------+------------------------------------------------+-------+
@@ -515,23 +650,25 @@ def scen_mysql_migration():
 Migrating: 2023_02_01_000000_add_published_at_to_posts
 Migrated:  2023_02_01_000000_add_published_at_to_posts (45.23ms)
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Database migration executed successfully for posts table",
-        [{
-            "desc": "Migration applied successfully",
-            "specifics": "php artisan migrate; added published_at column to posts",
-            "adjacent_context": "Migration completed in 45.23ms, batch 2"
-        }],
-        [],
-        ["Test new column functionality", "Update model and API documentation"]
-    )
-    return transcript, out
 
-def scen_ssl_cert_renewal():
-    """Scenario: SSL certificate renewal process"""
-    ts = nowstamp(90)
-    transcript = f"""Script started on {ts}
+_MYSQL_MIGRATION_OUT = json_obj(
+    "Database migration executed successfully for posts table",
+    [success(
+        desc="Migration applied successfully",
+        specifics="php artisan migrate; added published_at column to posts",
+        adjacent_context="Migration completed in 45.23ms, batch 2"
+    )],
+    [],
+    ["Test new column functionality", "Update model and API documentation"]
+)
+
+def scen_mysql_migration():
+    """Scenario: Database migration execution"""
+    ts = nowstamp(85)
+    transcript = esc(_MYSQL_MIGRATION_TRANSCRIPT).format(ts=ts)
+    return transcript, _MYSQL_MIGRATION_OUT
+
+_SSL_CERT_RENEWAL_TRANSCRIPT = """Script started on {ts}
 ~/ops │ on main ▓▒░ ─╮
 ❯ certbot certificates
 Found the following certs:
@@ -549,23 +686,25 @@ The following certificates are not due for renewal yet:
 ❯ certbot renew
 Cert not yet due for renewal
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "SSL certificate checked; renewal not yet needed (7 days remaining)",
-        [{
-            "desc": "Certificate status verified",
-            "specifics": "certbot certificates; certbot renew --dry-run",
-            "adjacent_context": "api.example.com expires 2025-09-15, 7 days remaining"
-        }],
-        [],
-        ["Set up automated renewal monitoring", "Schedule renewal check in 5 days"]
-    )
-    return transcript, out
 
-def scen_elasticsearch_indexing():
-    """Scenario: Elasticsearch index management"""
-    ts = nowstamp(95)
-    transcript = f"""Script started on {ts}
+_SSL_CERT_RENEWAL_OUT = json_obj(
+    "SSL certificate checked; renewal not yet needed (7 days remaining)",
+    [success(
+        desc="Certificate status verified",
+        specifics="certbot certificates; certbot renew --dry-run",
+        adjacent_context="api.example.com expires 2025-09-15, 7 days remaining"
+    )],
+    [],
+    ["Set up automated renewal monitoring", "Schedule renewal check in 5 days"]
+)
+
+def scen_ssl_cert_renewal():
+    """Scenario: SSL certificate renewal process"""
+    ts = nowstamp(90)
+    transcript = esc(_SSL_CERT_RENEWAL_TRANSCRIPT).format(ts=ts)
+    return transcript, _SSL_CERT_RENEWAL_OUT
+
+_ELASTICSEARCH_INDEXING_TRANSCRIPT = """Script started on {ts}
 ~/search │ on main ▓▒░ ─╮
 ❯ curl -X GET "localhost:9200/_cat/indices?v"
 health status index    uuid                   pri rep docs.count docs.deleted store.size pri.store.size
@@ -575,28 +714,30 @@ yellow open   products 5Gm4qF2kRoWaQN2m8vE7Kw   1   1      15420            0
 ❯ curl -X GET "localhost:9200/products/_search?size=0"
 {{"took":5,"timed_out":false,"_shards":{{"total":1,"successful":1,"skipped":0,"failed":0}},"hits":{{"total":{{"value":15420,"relation":"eq"}}}}}}
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Elasticsearch products index refreshed; 15,420 documents indexed",
-        [{
-            "desc": "Index status verified and refreshed",
-            "specifics": "curl _cat/indices; _refresh; _search with size=0",
-            "adjacent_context": "Products index: 15,420 docs, 12.4MB, yellow health"
-        }],
-        [{
-            "desc": "Index health status is yellow",
-            "impact": "Potential performance degradation or availability risk",
-            "owner_hint": "Search team / DevOps",
-            "resolution_hint": "Check replica configuration and cluster node status"
-        }],
-        ["Investigate yellow health status", "Consider adding replica nodes", "Monitor index performance"]
-    )
-    return transcript, out
 
-def scen_ansible_deployment():
-    """Scenario: Ansible playbook deployment"""
-    ts = nowstamp(100)
-    transcript = f"""Script started on {ts}
+_ELASTICSEARCH_INDEXING_OUT = json_obj(
+    "Elasticsearch products index refreshed; 15,420 documents indexed",
+    [success(
+        desc="Index status verified and refreshed",
+        specifics="curl _cat/indices; _refresh; _search with size=0",
+        adjacent_context="Products index: 15,420 docs, 12.4MB, yellow health"
+    )],
+    [blocker(
+        desc="Index health status is yellow",
+        impact="Potential performance degradation or availability risk",
+        owner_hint="Search team / DevOps",
+        resolution_hint="Check replica configuration and cluster node status"
+    )],
+    ["Investigate yellow health status", "Consider adding replica nodes", "Monitor index performance"]
+)
+
+def scen_elasticsearch_indexing():
+    """Scenario: Elasticsearch index management"""
+    ts = nowstamp(95)
+    transcript = esc(_ELASTICSEARCH_INDEXING_TRANSCRIPT).format(ts=ts)
+    return transcript, _ELASTICSEARCH_INDEXING_OUT
+
+_ANSIBLE_DEPLOYMENT_TRANSCRIPT = """Script started on {ts}
 ~/ansible │ on main ▓▒░ ─╮
 ❯ ansible-playbook -i inventory/production deploy.yml --check
 PLAY [Deploy application] ****************************************************
@@ -613,23 +754,25 @@ PLAY RECAP ********************************************************************
 web-01                     : ok=2    changed=2    unreachable=0    failed=0
 web-02                     : ok=2    changed=2    unreachable=0    failed=0
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Ansible deployment dry-run successful on production inventory",
-        [{
-            "desc": "Deployment playbook validated successfully",
-            "specifics": "ansible-playbook --check on production inventory",
-            "adjacent_context": "2 tasks changed on web-01 and web-02, no failures"
-        }],
-        [],
-        ["Execute actual deployment: ansible-playbook deploy.yml", "Monitor application health post-deployment"]
-    )
-    return transcript, out
 
-def scen_monitoring_alert():
-    """Scenario: Investigating monitoring alerts"""
-    ts = nowstamp(105)
-    transcript = f"""Script started on {ts}
+_ANSIBLE_DEPLOYMENT_OUT = json_obj(
+    "Ansible deployment dry-run successful on production inventory",
+    [success(
+        desc="Deployment playbook validated successfully",
+        specifics="ansible-playbook --check on production inventory",
+        adjacent_context="2 tasks changed on web-01 and web-02, no failures"
+    )],
+    [],
+    ["Execute actual deployment: ansible-playbook deploy.yml", "Monitor application health post-deployment"]
+)
+
+def scen_ansible_deployment():
+    """Scenario: Ansible playbook deployment"""
+    ts = nowstamp(100)
+    transcript = esc(_ANSIBLE_DEPLOYMENT_TRANSCRIPT).format(ts=ts)
+    return transcript, _ANSIBLE_DEPLOYMENT_OUT
+
+_MONITORING_ALERT_TRANSCRIPT = """Script started on {ts}
 ~/monitoring │ on main ▓▒░ ─╮
 ❯ kubectl get pods -n monitoring
 NAME                          READY   STATUS    RESTARTS   AGE
@@ -643,28 +786,30 @@ level=warn ts=2025-09-06T05:30:45.456Z caller=scrape.go:1234 component=scrape_ma
 NAME          TYPE        CLUSTER-IP      EXTERNAL-IP   PORT(S)    AGE
 api-service   ClusterIP   10.96.123.45    <none>        8080/TCP   5d
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Prometheus scrape failures identified for api-service metrics endpoint",
-        [{
-            "desc": "Monitoring stack health verified",
-            "specifics": "kubectl get pods -n monitoring; all pods running",
-            "adjacent_context": "Prometheus, Grafana, AlertManager running for 2 days"
-        }],
-        [{
-            "desc": "Prometheus scrape timeouts on api-service",
-            "impact": "Missing metrics data affecting monitoring and alerting",
-            "owner_hint": "API team / SRE",
-            "resolution_hint": "Check api-service health and metrics endpoint performance"
-        }],
-        ["Investigate api-service /metrics endpoint latency", "Increase scrape timeout if needed", "Check service discovery configuration"]
-    )
-    return transcript, out
 
-def scen_load_testing():
-    """Scenario: Load testing with Apache Bench"""
-    ts = nowstamp(110)
-    transcript = f"""Script started on {ts}
+_MONITORING_ALERT_OUT = json_obj(
+    "Prometheus scrape failures identified for api-service metrics endpoint",
+    [success(
+        desc="Monitoring stack health verified",
+        specifics="kubectl get pods -n monitoring; all pods running",
+        adjacent_context="Prometheus, Grafana, AlertManager running for 2 days"
+    )],
+    [blocker(
+        desc="Prometheus scrape timeouts on api-service",
+        impact="Missing metrics data affecting monitoring and alerting",
+        owner_hint="API team / SRE",
+        resolution_hint="Check api-service health and metrics endpoint performance"
+    )],
+    ["Investigate api-service /metrics endpoint latency", "Increase scrape timeout if needed", "Check service discovery configuration"]
+)
+
+def scen_monitoring_alert():
+    """Scenario: Investigating monitoring alerts"""
+    ts = nowstamp(105)
+    transcript = esc(_MONITORING_ALERT_TRANSCRIPT).format(ts=ts)
+    return transcript, _MONITORING_ALERT_OUT
+
+_LOAD_TESTING_TRANSCRIPT = """Script started on {ts}
 ~/testing │ on main ▓▒░ ─╮
 ❯ ab -n 1000 -c 10 http://localhost:8000/api/health
 This is ApacheBench, Version 2.3
@@ -684,23 +829,25 @@ Requests per second:    407.14 [#/sec] (mean)
 Time per request:       24.563 [ms] (mean)
 Time per request:       2.456 [ms] (mean, across all concurrent requests)
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Load test completed: 407 req/sec with 24ms avg response time",
-        [{
-            "desc": "Load test executed successfully",
-            "specifics": "ab -n 1000 -c 10 on /api/health endpoint",
-            "adjacent_context": "1000 requests, 0 failures, 407 req/sec, 24ms avg latency"
-        }],
-        [],
-        ["Baseline established for health endpoint performance", "Run tests against other critical endpoints", "Set up automated performance monitoring"]
-    )
-    return transcript, out
 
-def scen_backup_verification():
-    """Scenario: Database backup verification"""
-    ts = nowstamp(115)
-    transcript = f"""Script started on {ts}
+_LOAD_TESTING_OUT = json_obj(
+    "Load test completed: 407 req/sec with 24ms avg response time",
+    [success(
+        desc="Load test executed successfully",
+        specifics="ab -n 1000 -c 10 on /api/health endpoint",
+        adjacent_context="1000 requests, 0 failures, 407 req/sec, 24ms avg latency"
+    )],
+    [],
+    ["Baseline established for health endpoint performance", "Run tests against other critical endpoints", "Set up automated performance monitoring"]
+)
+
+def scen_load_testing():
+    """Scenario: Load testing with Apache Bench"""
+    ts = nowstamp(110)
+    transcript = esc(_LOAD_TESTING_TRANSCRIPT).format(ts=ts)
+    return transcript, _LOAD_TESTING_OUT
+
+_BACKUP_VERIFICATION_TRANSCRIPT = """Script started on {ts}
 ~/backups │ on main ▓▒░ ─╮
 ❯ ls -la /backups/postgres/
 total 2.1G
@@ -717,23 +864,25 @@ total 2.1G
 SET statement_timeout = 0;
 CREATE TABLE public.users (id SERIAL PRIMARY KEY...
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Database backup verification successful; latest backup is valid",
-        [{
-            "desc": "Backup integrity verified",
-            "specifics": "gunzip -t on latest backup; file structure validated",
-            "adjacent_context": "523MB backup from Sep 5, PostgreSQL 13.8"
-        }],
-        [],
-        ["Backup rotation working correctly", "Consider testing restore process monthly", "Monitor backup size growth"]
-    )
-    return transcript, out
 
-def scen_go_build_error():
-    """Scenario: Go build compilation error"""
-    ts = nowstamp(120)
-    transcript = f"""Script started on {ts}
+_BACKUP_VERIFICATION_OUT = json_obj(
+    "Database backup verification successful; latest backup is valid",
+    [success(
+        desc="Backup integrity verified",
+        specifics="gunzip -t on latest backup; file structure validated",
+        adjacent_context="523MB backup from Sep 5, PostgreSQL 13.8"
+    )],
+    [],
+    ["Backup rotation working correctly", "Consider testing restore process monthly", "Monitor backup size growth"]
+)
+
+def scen_backup_verification():
+    """Scenario: Database backup verification"""
+    ts = nowstamp(115)
+    transcript = esc(_BACKUP_VERIFICATION_TRANSCRIPT).format(ts=ts)
+    return transcript, _BACKUP_VERIFICATION_OUT
+
+_GO_BUILD_ERROR_TRANSCRIPT = """Script started on {ts}
 ~/go-service │ on feature/refactor ▓▒░ ─╮
 ❯ go version
 go version go1.21.3 darwin/amd64
@@ -747,28 +896,30 @@ go: added github.com/golang-jwt/jwt/v5 v5.0.0
 ❯ go build ./cmd/server
 Build successful: server
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Go build failed due to missing imports; resolved with go mod tidy",
-        [{
-            "desc": "Go module dependencies updated",
-            "specifics": "go mod tidy; added golang-jwt/jwt/v5 v5.0.0",
-            "adjacent_context": "Build successful after dependency resolution"
-        }],
-        [{
-            "desc": "Undefined symbols in auth package",
-            "impact": "Build failure preventing service deployment",
-            "owner_hint": "Go service team",
-            "resolution_hint": "Update import paths and struct field names"
-        }],
-        ["Update JWT import to v5 API", "Fix User struct field references", "Run go mod tidy after dependency changes"]
-    )
-    return transcript, out
 
-def scen_nginx_config_test():
-    """Scenario: Nginx configuration testing"""
-    ts = nowstamp(125)
-    transcript = f"""Script started on {ts}
+_GO_BUILD_ERROR_OUT = json_obj(
+    "Go build failed due to missing imports; resolved with go mod tidy",
+    [success(
+        desc="Go module dependencies updated",
+        specifics="go mod tidy; added golang-jwt/jwt/v5 v5.0.0",
+        adjacent_context="Build successful after dependency resolution"
+    )],
+    [blocker(
+        desc="Undefined symbols in auth package",
+        impact="Build failure preventing service deployment",
+        owner_hint="Go service team",
+        resolution_hint="Update import paths and struct field names"
+    )],
+    ["Update JWT import to v5 API", "Fix User struct field references", "Run go mod tidy after dependency changes"]
+)
+
+def scen_go_build_error():
+    """Scenario: Go build compilation error"""
+    ts = nowstamp(120)
+    transcript = esc(_GO_BUILD_ERROR_TRANSCRIPT).format(ts=ts)
+    return transcript, _GO_BUILD_ERROR_OUT
+
+_NGINX_CONFIG_TEST_TRANSCRIPT = """Script started on {ts}
 ~/nginx │ on main ▓▒░ ─╮
 ❯ nginx -v
 nginx version: nginx/1.21.6
@@ -782,28 +933,30 @@ nginx: the configuration file /etc/nginx/nginx.conf syntax is ok
 nginx: configuration file /etc/nginx/nginx.conf test is successful
 ❯ sudo nginx -s reload
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Nginx configuration error fixed; config test passed and reloaded",
-        [{
-            "desc": "Nginx configuration validated and reloaded",
-            "specifics": "nginx -t; sudo nginx -s reload",
-            "adjacent_context": "Fixed proxy_pass directive in api.conf line 15"
-        }],
-        [{
-            "desc": "Invalid proxy_pass directive syntax",
-            "impact": "Nginx config test failed preventing reload",
-            "owner_hint": "DevOps / Infrastructure team",
-            "resolution_hint": "Fix proxy_pass syntax and test before reload"
-        }],
-        ["Test nginx config before applying changes", "Use nginx -t in CI/CD pipeline", "Document nginx configuration patterns"]
-    )
-    return transcript, out
 
-def scen_aws_cli_deployment():
-    """Scenario: AWS CLI deployment operations"""
-    ts = nowstamp(130)
-    transcript = f"""Script started on {ts}
+_NGINX_CONFIG_TEST_OUT = json_obj(
+    "Nginx configuration error fixed; config test passed and reloaded",
+    [success(
+        desc="Nginx configuration validated and reloaded",
+        specifics="nginx -t; sudo nginx -s reload",
+        adjacent_context="Fixed proxy_pass directive in api.conf line 15"
+    )],
+    [blocker(
+        desc="Invalid proxy_pass directive syntax",
+        impact="Nginx config test failed preventing reload",
+        owner_hint="DevOps / Infrastructure team",
+        resolution_hint="Fix proxy_pass syntax and test before reload"
+    )],
+    ["Test nginx config before applying changes", "Use nginx -t in CI/CD pipeline", "Document nginx configuration patterns"]
+)
+
+def scen_nginx_config_test():
+    """Scenario: Nginx configuration testing"""
+    ts = nowstamp(125)
+    transcript = esc(_NGINX_CONFIG_TEST_TRANSCRIPT).format(ts=ts)
+    return transcript, _NGINX_CONFIG_TEST_OUT
+
+_AWS_CLI_DEPLOYMENT_TRANSCRIPT = """Script started on {ts}
 ~/aws │ on main ▓▒░ ─╮
 ❯ aws --version
 aws-cli/2.13.25 Python/3.11.5 Darwin/22.6.0 exe/x86_64
@@ -826,27 +979,29 @@ delete: s3://my-app-frontend/old-file.js
     }}
 }}
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "AWS S3 deployment successful with CloudFront cache invalidation",
-        [{
-            "desc": "Frontend assets deployed to S3",
-            "specifics": "aws s3 sync ./dist with --delete flag",
-            "adjacent_context": "Uploaded 3 files, deleted 1 old file"
-        }, {
-            "desc": "CloudFront cache invalidation initiated",
-            "specifics": "aws cloudfront create-invalidation for all paths",
-            "adjacent_context": "Distribution E1234567890123, invalidation in progress"
-        }],
-        [],
-        ["Monitor invalidation completion", "Set up automated deployment pipeline", "Consider using CloudFront Functions for cache control"]
-    )
-    return transcript, out
 
-def scen_java_maven_test():
-    """Scenario: Maven test execution with failures"""
-    ts = nowstamp(135)
-    transcript = f"""Script started on {ts}
+_AWS_CLI_DEPLOYMENT_OUT = json_obj(
+    "AWS S3 deployment successful with CloudFront cache invalidation",
+    [success(
+        desc="Frontend assets deployed to S3",
+        specifics="aws s3 sync ./dist with --delete flag",
+        adjacent_context="Uploaded 3 files, deleted 1 old file"
+    ), success(
+        desc="CloudFront cache invalidation initiated",
+        specifics="aws cloudfront create-invalidation for all paths",
+        adjacent_context="Distribution E1234567890123, invalidation in progress"
+    )],
+    [],
+    ["Monitor invalidation completion", "Set up automated deployment pipeline", "Consider using CloudFront Functions for cache control"]
+)
+
+def scen_aws_cli_deployment():
+    """Scenario: AWS CLI deployment operations"""
+    ts = nowstamp(130)
+    transcript = esc(_AWS_CLI_DEPLOYMENT_TRANSCRIPT).format(ts=ts)
+    return transcript, _AWS_CLI_DEPLOYMENT_OUT
+
+_JAVA_MAVEN_TEST_TRANSCRIPT = """Script started on {ts}
 ~/java-api │ on main ▓▒░ ─╮
 ❯ java -version
 openjdk version "17.0.7" 2023-04-18
@@ -863,28 +1018,30 @@ Apache Maven 3.9.4
 [ERROR] Tests run: 5, Failures: 2, Errors: 0, Skipped: 0, Time elapsed: 2.456 s
 [INFO] BUILD FAILURE
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Maven test execution failed; 2 test failures in UserServiceTest",
-        [{
-            "desc": "Maven test suite executed",
-            "specifics": "mvn test; 5 tests run in 2.456s",
-            "adjacent_context": "Java 17, Maven 3.9.4"
-        }],
-        [{
-            "desc": "Test failures in UserServiceTest",
-            "impact": "Build pipeline blocked; potential regression in user service",
-            "owner_hint": "Java API team",
-            "resolution_hint": "Fix testCreateUser status code and testDeleteUser null handling"
-        }],
-        ["Debug testCreateUser expected vs actual status codes", "Fix NullPointerException in testDeleteUser", "Review recent changes to UserService"]
-    )
-    return transcript, out
 
-def scen_prometheus_query():
-    """Scenario: Prometheus metrics querying"""
-    ts = nowstamp(140)
-    transcript = f"""Script started on {ts}
+_JAVA_MAVEN_TEST_OUT = json_obj(
+    "Maven test execution failed; 2 test failures in UserServiceTest",
+    [success(
+        desc="Maven test suite executed",
+        specifics="mvn test; 5 tests run in 2.456s",
+        adjacent_context="Java 17, Maven 3.9.4"
+    )],
+    [blocker(
+        desc="Test failures in UserServiceTest",
+        impact="Build pipeline blocked; potential regression in user service",
+        owner_hint="Java API team",
+        resolution_hint="Fix testCreateUser status code and testDeleteUser null handling"
+    )],
+    ["Debug testCreateUser expected vs actual status codes", "Fix NullPointerException in testDeleteUser", "Review recent changes to UserService"]
+)
+
+def scen_java_maven_test():
+    """Scenario: Maven test execution with failures"""
+    ts = nowstamp(135)
+    transcript = esc(_JAVA_MAVEN_TEST_TRANSCRIPT).format(ts=ts)
+    return transcript, _JAVA_MAVEN_TEST_OUT
+
+_PROMETHEUS_QUERY_TRANSCRIPT = """Script started on {ts}
 ~/monitoring │ on main ▓▒░ ─╮
 ❯ curl -s "http://localhost:9090/api/v1/query?query=up" | jq '.data.result[] | select(.metric.job=="api-service")'
 {{
@@ -903,23 +1060,28 @@ def scen_prometheus_query():
 ❯ curl -s "http://localhost:9090/api/v1/query?query=histogram_quantile(0.95,rate(http_request_duration_seconds_bucket[5m]))" | jq '.data.result[0].value[1]'
 "0.234"
 """
-    transcript = esc(transcript)
-    out = json_obj(
-        "Prometheus metrics analysis shows api-service down, 127 req/s, 234ms p95 latency",
-        [{
-            "desc": "Prometheus metrics queried successfully",
-            "specifics": "up, rate(http_requests_total), histogram_quantile queries",
-            "adjacent_context": "127.45 req/s rate, 234ms p95 latency"
-        }],
-        [{
-            "desc": "API service health check failing",
-            "impact": "Service appears down (up=0) affecting availability monitoring",
-            "owner_hint": "API team / SRE",
-            "resolution_hint": "Investigate api-service:8080 health and connectivity"
-        }],
-        ["Check api-service pod/container status", "Verify health check endpoint", "Review service discovery configuration"]
-    )
-    return transcript, out
+
+_PROMETHEUS_QUERY_OUT = json_obj(
+    "Prometheus metrics analysis shows api-service down, 127 req/s, 234ms p95 latency",
+    [success(
+        desc="Prometheus metrics queried successfully",
+        specifics="up, rate(http_requests_total), histogram_quantile queries",
+        adjacent_context="127.45 req/s rate, 234ms p95 latency"
+    )],
+    [blocker(
+        desc="API service health check failing",
+        impact="Service appears down (up=0) affecting availability monitoring",
+        owner_hint="API team / SRE",
+        resolution_hint="Investigate api-service:8080 health and connectivity"
+    )],
+    ["Check api-service pod/container status", "Verify health check endpoint", "Review service discovery configuration"]
+)
+
+def scen_prometheus_query():
+    """Scenario: Prometheus metrics querying"""
+    ts = nowstamp(140)
+    transcript = esc(_PROMETHEUS_QUERY_TRANSCRIPT).format(ts=ts)
+    return transcript, _PROMETHEUS_QUERY_OUT
 
 SCENARIOS = [
     scen_py_tests_ok,
@@ -949,19 +1111,39 @@ SCENARIOS = [
     scen_prometheus_query,
 ]
 
+# Harmony developer message, identical for every example
+_DEV_CONTENT = (
+    "# Instructions\n\n"
+    "reasoning language: English\n\n"
+    "You convert terminal transcripts into structured session reports.\n"
+    "Respond with STRICT JSON only, matching the provided schema exactly.\n"
+    "Do not include code fences, comments, or extra text.\n\n"
+    + SCHEMA_TEXT
+)
+
+# Assistant JSON per output object, keyed by id(). Scenario outputs are
+# shared read-only module constants, so each is serialized only once; the
+# object is kept alongside its text so the id cannot be reused. The cap
+# keeps callers passing fresh dicts from growing the memo without bound.
+_ASSISTANT_JSON = {}
+_ASSISTANT_JSON_MAX = 256
+
+def _assistant_json(out_json):
+    """Serialize an expected output, reusing the text for shared outputs"""
+    cached = _ASSISTANT_JSON.get(id(out_json))
+    if cached is not None and cached[0] is out_json:
+        return cached[1]
+    text = json.dumps(out_json, ensure_ascii=False)
+    if len(_ASSISTANT_JSON) < _ASSISTANT_JSON_MAX:
+        _ASSISTANT_JSON[id(out_json)] = (out_json, text)
+    return text
+
 def make_messages(transcript, out_json):
     """Create message format compatible with GPT-OSS Harmony format"""
     return [
         {
             "role": "developer", 
-            "content": (
-                "# Instructions\n\n"
-                "reasoning language: English\n\n"
-                "You convert terminal transcripts into structured session reports.\n"
-                "Respond with STRICT JSON only, matching the provided schema exactly.\n"
-                "Do not include code fences, comments, or extra text.\n\n"
-                f"{SCHEMA_TEXT}"
-            )
+            "content": _DEV_CONTENT
         },
         {
             "role": "user", 
@@ -969,12 +1151,12 @@ def make_messages(transcript, out_json):
         },
         {
             "role": "assistant",
-            "content": json.dumps(out_json, ensure_ascii=False)
+            "content": _assistant_json(out_json)
         }
     ]
 
-def synthesize(n=48):
-    """Generate synthetic training data"""
+def _synthesize_rows(n):
+    """Generate n rows using the module-level random state"""
     rows_pairs = []
     rows_msgs = []
     
@@ -998,6 +1180,86 @@ def synthesize(n=48):
     
     return rows_pairs, rows_msgs
 
+_SYNTH_CHUNK_ROWS = 32
+
+def _synthesize_chunk(job):
+    """Worker entry point: reseed, then generate one chunk of rows"""
+    index, seed, n = job
+    random.seed(seed)
+    return index, _synthesize_rows(n)
+
+def synthesize(n=48, workers=1):
+    """Generate synthetic training data
+
+    With workers > 1 (or None for one per CPU) the rows are generated in
+    fixed-size chunks across a process pool. Each chunk is reseeded from the
+    module RNG and put back in its original position, so the result is
+    reproducible and independent of the worker count, but differs from the
+    workers=1 sequence.
+    """
+    if workers is not None and workers <= 1:
+        return _synthesize_rows(n)
+
+    jobs = []
+    for index, start in enumerate(range(0, n, _SYNTH_CHUNK_ROWS)):
+        jobs.append((index, random.getrandbits(32), min(_SYNTH_CHUNK_ROWS, n - start)))
+
+    chunks = [None] * len(jobs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        # Chunks reseed the module RNG; restore the caller's state afterwards
+        # so the inline path leaves it exactly as the pool path does
+        state = random.getstate()
+        try:
+            for index, chunk in map(_synthesize_chunk, jobs):
+                chunks[index] = chunk
+        finally:
+            random.setstate(state)
+    else:
+        # Imported here: sequential runs never need multiprocessing
+        from multiprocessing import Pool
+
+        with Pool(processes=min(workers, len(jobs))) as pool:
+            # Take chunks as they finish; slots keep the output order stable
+            for index, chunk in pool.imap_unordered(_synthesize_chunk, jobs):
+                chunks[index] = chunk
+
+    rows_pairs = []
+    rows_msgs = []
+    for pairs, msgs in chunks:
+        rows_pairs.extend(pairs)
+        rows_msgs.extend(msgs)
+    return rows_pairs, rows_msgs
+
+if orjson is not None:
+    def _jsonl_line(row):
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    def _jsonl_line(row):
+        return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+# Level 1 is close to memcpy speed and still shrinks JSONL several-fold
+_GZIP_LEVEL = 1
+
+def write_jsonl(path, rows):
+    """Write rows as compact UTF-8 JSONL, serialized into one blob and written in one go
+
+    Paths ending in .gz are gzip-compressed (with a fixed mtime, so the same
+    rows always produce the same bytes).
+    """
+    blob = b"".join(map(_jsonl_line, rows))
+    if str(path).endswith(".gz"):
+        blob = gzip.compress(blob, compresslevel=_GZIP_LEVEL, mtime=0)
+    blob = memoryview(blob)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may be partial for large buffers
+        while blob:
+            blob = blob[os.write(fd, blob):]
+    finally:
+        os.close(fd)
+
 def main():
     """Generate and save synthetic training data"""
     pairs, msgs = synthesize(128)  # Increased from 64 to 128 examples
@@ -1006,20 +1268,15 @@ def main():
     data_dir = Path(__file__).parent / "data"
     data_dir.mkdir(exist_ok=True)
     
-    pairs_path = data_dir / "pairs.jsonl"
-    msgs_path = data_dir / "harmony_messages.jsonl"
-    
-    with open(pairs_path, "w") as f:
-        for row in pairs:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    pairs_path = data_dir / "pairs.jsonl.gz"
+    msgs_path = data_dir / "harmony_messages.jsonl.gz"
     
-    with open(msgs_path, "w") as f:
-        for row in msgs:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    write_jsonl(pairs_path, pairs)
+    write_jsonl(msgs_path, msgs)
     
     print(f"Generated {len(pairs)} training examples")
     print(f"Saved to: {pairs_path} and {msgs_path}")
-    print(f"The harmony_messages.jsonl file is compatible with GPT-OSS Colab notebook")
+    print(f"The harmony_messages.jsonl.gz file is compatible with GPT-OSS Colab notebook")
     
     # Show a tiny preview (first example)
     print("\nPreview of Harmony format message:")
@@ -1,7 +1,7 @@
 """
 Setup script for InnerBoard-local.
 """
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 # Read README
@@ -10,9 +10,8 @@ long_description = (this_directory / "README.md").read_text(encoding="utf-8")
 
 # Read requirements
 def read_requirements():
-    requirements_path = this_directory / "requirements.txt"
-    with requirements_path.open("r", encoding="utf-8") as f:
-        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    lines = (this_directory / "requirements.txt").read_text(encoding="utf-8").splitlines()
+    return [req for line in lines if (req := line.strip()) and not req.startswith("#")]
 
 setup(
     name="innerboard-local",
@@ -23,7 +22,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/ramper-labs/InnerBoard-local",
-    packages=find_packages(),
+    packages=["app"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: End Users/Desktop",
@@ -48,6 +47,11 @@ setup(
             "pytest>=8.0.2",
             "pytest-cov>=4.1.0",
             "pytest-mock>=3.12.0",
+            "hypothesis>=6.98.0",
+        ],
+        "fast": [
+            "orjson>=3.9",
+            "xxhash>=3.0",
         ],
     },
     entry_points={
@@ -56,7 +60,6 @@ setup(
             "innerboard-legacy=app.main:main",
         ],
     },
-    include_package_data=True,
     package_data={
         "app": ["prompts/*.txt"],
     },
@@ -2,23 +2,31 @@
 Pytest configuration and fixtures for InnerBoard-local tests.
 """
 
+import asyncio
+import logging
+import os
 import pytest
-import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock
-from typing import Generator
+from hypothesis import settings
 
+import app.cache
 from app.config import config
 from app.storage import EncryptedVault
 from app.security import SecureKeyManager
-from app.cache import cache_manager
+from app.cache import CacheManager, ConnectionPool, TTLCache, cache_manager
+from app.llm import LocalLLM
+
+# Property-based test budgets; select with HYPOTHESIS_PROFILE=ci
+settings.register_profile("fast", max_examples=5, deadline=None)
+settings.register_profile("ci", max_examples=20, deadline=None)
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "fast"))
 
 
 @pytest.fixture(scope="session")
-def temp_dir() -> Generator[Path, None, None]:
+def temp_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """Create a temporary directory for the test session."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+    return tmp_path_factory.mktemp("session")
 
 
 @pytest.fixture
@@ -39,26 +47,88 @@ def secure_key_manager(temp_key_path: Path) -> SecureKeyManager:
     return SecureKeyManager(temp_key_path)
 
 
-@pytest.fixture
-def master_key(secure_key_manager: SecureKeyManager) -> bytes:
-    """Generate a master key for testing."""
-    return secure_key_manager.generate_master_key("test_password")
+@pytest.fixture(scope="session")
+def master_key(temp_dir: Path) -> bytes:
+    """Generate one master key for the test session.
+
+    Key derivation is deliberately slow, so tests that only need a working
+    vault share this key; tests of the password flow build their own.
+    """
+    return SecureKeyManager(temp_dir / "session.key").generate_master_key()
 
 
 @pytest.fixture
-def encrypted_vault(temp_db_path: Path, master_key: bytes) -> EncryptedVault:
-    """Create an encrypted vault for testing."""
-    vault = EncryptedVault(str(temp_db_path), master_key)
+def encrypted_vault(tmp_path: Path, master_key: bytes) -> EncryptedVault:
+    """Create an encrypted vault in a fresh per-test database."""
+    vault = EncryptedVault(str(tmp_path / "test.db"), master_key)
+    yield vault
+    vault.close()
+
+
+@pytest.fixture(scope="class")
+def class_vault(
+    tmp_path_factory: pytest.TempPathFactory, master_key: bytes
+) -> EncryptedVault:
+    """Open one encrypted vault for all tests in a class."""
+    db_path = tmp_path_factory.mktemp("vault") / "shared.db"
+    vault = EncryptedVault(str(db_path), master_key)
     yield vault
     vault.close()
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
+def shared_vault(class_vault: EncryptedVault) -> EncryptedVault:
+    """The class-wide vault, emptied before the test. Tests must not close it."""
+    class_vault.secure_erase_all()
+    return class_vault
+
+
+@pytest.fixture
 def clear_caches():
-    """Clear all caches before each test."""
+    """Clear all caches before a test.
+
+    Applied automatically to performance-marked tests; other tests that touch
+    the global caches opt in with ``@pytest.mark.usefixtures("clear_caches")``.
+    """
     cache_manager.clear_all()
 
 
+@pytest.fixture
+def isolated_cache_manager(monkeypatch) -> CacheManager:
+    """Point app.cache at empty global caches and a matching CacheManager.
+
+    Decorators applied during the test bind to the fresh caches; monkeypatch
+    puts the real ones back at teardown without clearing them.
+    """
+    for name in ("response", "model", "reflection"):
+        original = getattr(app.cache, f"{name}_cache")
+        monkeypatch.setattr(
+            app.cache,
+            f"{name}_cache",
+            TTLCache(default_ttl=original.default_ttl, max_size=original.max_size),
+        )
+    manager = CacheManager()
+    monkeypatch.setattr(app.cache, "cache_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def fake_llm_pool(monkeypatch):
+    """Swap LocalLLM's client pool for one built from MagicMock clients.
+
+    Returns a dict whose "n" entry counts factory calls. The original pool
+    is restored by monkeypatch at teardown.
+    """
+    calls = {"n": 0}
+
+    def factory():
+        calls["n"] += 1
+        return MagicMock()
+
+    monkeypatch.setattr(LocalLLM, "_client_pool", ConnectionPool(factory, max_size=2))
+    return calls
+
+
 @pytest.fixture
 def mock_ollama_client():
     """Mock Ollama client for testing."""
@@ -107,8 +177,6 @@ def valid_reflection_texts() -> list:
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an event loop for async tests."""
-    import asyncio
-
     loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
@@ -122,11 +190,30 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "security: mark test as security-related")
     config.addinivalue_line("markers", "performance: mark test as performance-related")
     config.addinivalue_line("markers", "unit: mark test as unit test")
+    config.addinivalue_line(
+        "markers", "network: mark test as needing internet access (--run-network)"
+    )
+
+
+def pytest_addoption(parser):
+    """Add command line options."""
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests that need internet access",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on test names."""
+    skip_network = pytest.mark.skip(reason="needs internet access (use --run-network)")
+    run_network = config.getoption("--run-network")
+
     for item in items:
+        if not run_network and item.get_closest_marker("network"):
+            item.add_marker(skip_network)
+
         # Add markers based on test file names
         if "security" in str(item.fspath):
             item.add_marker(pytest.mark.security)
@@ -137,13 +224,20 @@ def pytest_collection_modifyitems(config, items):
         else:
             item.add_marker(pytest.mark.unit)
 
+        # Only cache-heavy tests pay for resetting the global caches; tests on
+        # isolated caches leave the globals alone
+        if (
+            item.get_closest_marker("performance")
+            and "clear_caches" not in item.fixturenames
+            and "isolated_cache_manager" not in item.fixturenames
+        ):
+            item.fixturenames.insert(0, "clear_caches")
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
     """Set up test environment."""
     # Disable logging during tests unless explicitly enabled
-    import logging
-
     logging.getLogger("innerboard").setLevel(logging.WARNING)
 
     # Clean up any leftover test files
@@ -2,7 +2,9 @@
 Tests for caching system.
 """
 
+import pickle
 import pytest
+import threading
 import time
 from unittest.mock import Mock, patch
 from app.cache import (
@@ -13,6 +15,7 @@ from app.cache import (
     cached_response,
     cached_model,
     cached_reflection,
+    response_cache,
 )
 
 
@@ -48,8 +51,23 @@ class TestTTLCache:
         time.sleep(1.1)
         assert cache.get("temp") is None
 
+    def test_cache_non_finite_ttl(self):
+        """Test an infinite TTL never expires and a NaN TTL is rejected."""
+        cache = TTLCache(default_ttl=10)
+
+        cache.set("forever", "value", ttl=float("inf"))
+        cache.set("gone", "value", ttl=float("-inf"))
+        assert cache.get("forever") == "value"
+        assert cache.get("gone") is None
+        assert cache._cleanup_expired() == 0
+        assert "forever" in cache
+
+        with pytest.raises(ValueError):
+            cache.set("bad", "value", ttl=float("nan"))
+        assert "bad" not in cache
+
     def test_cache_size_limits(self):
-        """Test cache size limits and cleanup."""
+        """Test cache size limits evict the least recently used entry."""
         cache = TTLCache(max_size=3)
 
         # Fill cache
@@ -61,12 +79,33 @@ class TestTTLCache:
         assert cache.get("key2") == "value2"
         assert cache.get("key3") == "value3"
 
-        # Add one more (should trigger cleanup and size limit)
+        # Touch key1 again so key2 becomes the least recently used
+        assert cache.get("key1") == "value1"
+
+        # Add one more (should evict key2)
         cache.set("key4", "value4")
 
-        # Cache should have cleaned up expired entries and limited size
         stats = cache.stats()
-        assert stats["size"] <= cache.max_size
+        assert stats["size"] == cache.max_size
+        assert cache.get("key2") is None
+        assert cache.get("key1") == "value1"
+        assert cache.get("key3") == "value3"
+        assert cache.get("key4") == "value4"
+
+    def test_sharded_size_limits(self):
+        """Test each shard gets an even slice of max_size."""
+        cache = TTLCache(max_size=100, shards=16)
+
+        stats = cache.stats()
+        assert stats["shards"] == 8  # Capped so shards keep 8+ entries
+        assert stats["shard_max_size"] == 100 // 8
+
+        for i in range(1000):
+            cache.set(f"key_{i}", i)
+
+        # Every shard is full, so the total is the sum of the shard limits
+        assert cache.stats()["size"] == stats["shards"] * stats["shard_max_size"]
+        assert cache.stats()["size"] <= cache.max_size
 
     def test_cache_statistics(self):
         """Test cache statistics."""
@@ -94,6 +133,19 @@ class TestTTLCache:
         assert stats["hit_rate"] == 0.75
         assert stats["total_requests"] == 4
 
+    def test_cache_snapshot(self):
+        """Test snapshot returns raw counters matching stats."""
+        cache = TTLCache()
+
+        cache.set("key1", "value1")
+        cache.get("key1")  # Hit
+        cache.get("nonexistent")  # Miss
+
+        assert cache.snapshot() == (1, 1, 1)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == cache.snapshot()
+
     def test_cache_clear(self):
         """Test cache clearing."""
         cache = TTLCache()
@@ -117,6 +169,42 @@ class TestTTLCache:
             stats["misses"] == 2
         )  # We had 2 misses after clearing (trying to get non-existent keys)
 
+    def test_cache_contains(self):
+        """Test membership checks do not count as hits or misses."""
+        cache = TTLCache()
+
+        cache.set("key1", "value1")
+        cache.set("short", "value", ttl=0)
+
+        assert "key1" in cache
+        assert "nonexistent" not in cache
+        assert "short" not in cache  # Already expired
+
+        stats = cache.stats()
+        assert stats["hits"] == 0
+        assert stats["misses"] == 0
+
+    def test_sharded_cache_concurrent_access(self):
+        """Test concurrent access across shards keeps size and counters consistent."""
+        cache = TTLCache(max_size=1000, shards=16)
+
+        def worker(worker_id):
+            for i in range(50):
+                key = f"w{worker_id}_k{i}"
+                cache.set(key, i)
+                assert cache.get(key) == i
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert stats["size"] == 400
+        assert stats["hits"] == 400
+        assert stats["misses"] == 0
+
 
 class TestCachedFunction:
     """Test cached function decorator."""
@@ -175,6 +263,102 @@ class TestCachedFunction:
         test_func()
         assert call_count == 2
 
+    def test_cached_function_caches_none(self):
+        """Test None results are cached like any other value."""
+        cache = TTLCache(default_ttl=10)
+        call_count = 0
+
+        @CachedFunction(cache)
+        def lookup():
+            nonlocal call_count
+            call_count += 1
+            return None
+
+        assert lookup() is None
+        assert lookup() is None
+        assert call_count == 1
+
+    def test_cached_function_str_keys(self):
+        """Test single str arguments are keyed per function and per text."""
+        cache = TTLCache(default_ttl=10)
+
+        @CachedFunction(cache)
+        def upper(text):
+            return text.upper()
+
+        @CachedFunction(cache)
+        def lower(text):
+            return text.lower()
+
+        assert upper("Reflection") == "REFLECTION"
+        assert lower("Reflection") == "reflection"
+        assert upper("Other") == "OTHER"
+        assert upper("Reflection") == "REFLECTION"
+        assert upper("\ud800") == "\ud800"  # Lone surrogates are still keyable
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["size"] == 4
+
+    def test_cached_function_argument_keys(self):
+        """Test keys distinguish argument types and accept unhashable arguments."""
+        cache = TTLCache(default_ttl=10)
+        calls = []
+
+        @CachedFunction(cache)
+        def describe(value):
+            calls.append(value)
+            return repr(value)
+
+        assert describe(1) == "1"
+        assert describe("1") == "'1'"
+        assert len(calls) == 2
+
+        # Unhashable arguments are keyed by their serialized form
+        assert describe([1, 2]) == "[1, 2]"
+        assert describe([1, 2]) == "[1, 2]"
+        assert len(calls) == 3
+
+        # Unpicklable arguments fall back to string keys
+        lock = threading.Lock()
+        describe(lock)
+        describe(lock)
+        assert len(calls) == 4
+
+    def test_cached_method_keys_instance_by_identity(self):
+        """Test a cached method keeps one key per instance whatever its state."""
+        cache = TTLCache(default_ttl=10)
+
+        class Service:
+            def __init__(self):
+                self.client = threading.Lock()  # Unpicklable, like a live client
+                self.calls = 0
+
+            @CachedFunction(cache)
+            def check(self, name="default"):
+                self.calls += 1
+                return f"{name}-ok"
+
+        service = Service()
+        with patch("app.cache.pickle.dumps", wraps=pickle.dumps) as dumps:
+            assert service.check() == "default-ok"
+            service.client = None  # Now the instance itself would pickle
+            assert service.check() == "default-ok"
+            assert service.check() == "default-ok"
+
+        assert service.calls == 1
+        assert cache.stats()["size"] == 1
+        # The instance is never pickled, so each key is built in one attempt
+        assert dumps.call_count == 3
+        assert all(service not in call.args[0][2] for call in dumps.call_args_list)
+
+        # Other arguments and other instances still get their own entries
+        assert service.check("other") == "other-ok"
+        assert service.calls == 2
+        other = Service()
+        assert other.check() == "default-ok"
+        assert other.calls == 1
+
 
 class TestConnectionPool:
     """Test connection pool functionality."""
@@ -215,6 +399,21 @@ class TestConnectionPool:
         pool.put(conn2)  # Should be accepted
         pool.put(conn3)  # Should be rejected (pool full)
 
+    def test_connection_pool_prewarm(self):
+        """Test prewarmed connections are created up front and reused."""
+        factory = Mock(side_effect=lambda: Mock())
+
+        pool = ConnectionPool(factory, max_size=2, prewarm=5)
+        assert factory.call_count == 2  # Capped at max_size
+
+        pool.get()
+        pool.get()
+        assert factory.call_count == 2
+
+        # Pool is drained, so the next get creates a connection
+        pool.get()
+        assert factory.call_count == 3
+
     def test_connection_pool_clear(self):
         """Test connection pool clearing."""
 
@@ -301,52 +500,47 @@ class TestDecorators:
 class TestCacheManager:
     """Test cache manager functionality."""
 
-    def test_cache_manager_stats(self):
+    def test_cache_manager_stats(self, isolated_cache_manager):
         """Test cache manager statistics."""
-        # Clear any existing data
-        cache_manager.clear_all()
+        caches = isolated_cache_manager.caches
 
         # Add some data to different caches
-        from app.cache import response_cache, model_cache
-
-        response_cache.set("test_response", "response_data")
-        model_cache.set("test_model", "model_data")
+        caches["response"].set("test_response", "response_data")
+        caches["model"].set("test_model", "model_data")
 
-        stats = cache_manager.get_stats()
+        stats = isolated_cache_manager.get_stats()
 
         assert "response" in stats
         assert "model" in stats
         assert "reflection" in stats
 
-        assert stats["response"]["size"] >= 1
-        assert stats["model"]["size"] >= 1
+        assert stats["response"]["size"] == 1
+        assert stats["model"]["size"] == 1
 
-    def test_cache_manager_clear_all(self):
+    def test_cache_manager_clear_all(self, isolated_cache_manager):
         """Test clearing all caches."""
-        # Add data to caches
-        from app.cache import response_cache, model_cache, reflection_cache
+        caches = isolated_cache_manager.caches
 
-        response_cache.set("test1", "data1")
-        model_cache.set("test2", "data2")
-        reflection_cache.set("test3", "data3")
+        # Add data to caches
+        caches["response"].set("test1", "data1")
+        caches["model"].set("test2", "data2")
+        caches["reflection"].set("test3", "data3")
 
         # Verify data exists
-        assert response_cache.get("test1") is not None
-        assert model_cache.get("test2") is not None
-        assert reflection_cache.get("test3") is not None
+        assert caches["response"].get("test1") is not None
+        assert caches["model"].get("test2") is not None
+        assert caches["reflection"].get("test3") is not None
 
         # Clear all
-        cache_manager.clear_all()
+        isolated_cache_manager.clear_all()
 
         # Verify data is gone
-        assert response_cache.get("test1") is None
-        assert model_cache.get("test2") is None
-        assert reflection_cache.get("test3") is None
+        assert caches["response"].get("test1") is None
+        assert caches["model"].get("test2") is None
+        assert caches["reflection"].get("test3") is None
 
     def test_cache_manager_cleanup(self):
         """Test cache cleanup functionality."""
-        from app.cache import response_cache
-
         # Add some data with short TTL
         response_cache.set("short", "data", ttl=1)
         response_cache.set("long", "data", ttl=60)
@@ -364,11 +558,8 @@ class TestCacheManager:
 class TestIntegration:
     """Integration tests for caching system."""
 
-    def test_multi_cache_scenario(self):
+    def test_multi_cache_scenario(self, isolated_cache_manager):
         """Test multiple caches working together."""
-        # Clear all caches
-        cache_manager.clear_all()
-
         # Simulate a complex workflow with multiple cache types
         @cached_response(ttl=5)
         def fetch_user_data(user_id):
@@ -393,10 +584,10 @@ class TestIntegration:
         assert "analysis_of_" in analysis
 
         # Check cache stats
-        stats = cache_manager.get_stats()
-        assert stats["response"]["size"] >= 1
-        assert stats["model"]["size"] >= 1
-        assert stats["reflection"]["size"] >= 1
+        stats = isolated_cache_manager.get_stats()
+        assert stats["response"]["size"] == 1
+        assert stats["model"]["size"] == 1
+        assert stats["reflection"]["size"] == 1
 
     def test_cache_performance_under_load(self):
         """Test cache performance under simulated load."""
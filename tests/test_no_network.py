@@ -19,6 +19,24 @@ def test_no_network_blocks_socket_connection():
 
 
 def test_network_is_restored_after_context():
+    """
+    Ensures that socket.socket.connect is restored after the context manager exits.
+    """
+    original_connect = socket.socket.connect
+
+    with no_network():
+        assert socket.socket.connect is not original_connect
+    assert socket.socket.connect is original_connect
+
+    # Also restored when the guarded block raises
+    with pytest.raises(NetworkAccessBlocked):
+        with no_network():
+            socket.create_connection(("8.8.8.8", 53), timeout=1)
+    assert socket.socket.connect is original_connect
+
+
+@pytest.mark.network
+def test_network_is_restored_after_context_live():
     """
     Ensures that network access is restored after the context manager exits.
     """
@@ -46,6 +64,23 @@ def test_network_is_restored_after_context():
         pytest.fail(f"Network connection failed after context exit: {e}")
 
 
+def test_no_network_blocks_higher_level_libraries_by_ip():
+    """
+    Ensures that 'requests' is blocked when no DNS lookup is involved.
+    """
+    with pytest.raises(NetworkAccessBlocked):
+        with no_network():
+            try:
+                requests.get("https://8.8.8.8", timeout=1)
+            except requests.exceptions.RequestException as e:
+                if not isinstance(e.__cause__, NetworkAccessBlocked):
+                    pytest.fail(
+                        f"Request failed but not due to NetworkAccessBlocked. Cause: {e.__cause__}"
+                    )
+                raise e.__cause__
+
+
+@pytest.mark.network
 def test_no_network_blocks_higher_level_libraries():
     """
     Ensures that libraries like 'requests' are also blocked.
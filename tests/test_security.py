@@ -3,10 +3,10 @@ Tests for security features.
 """
 
 import pytest
-import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from cryptography.fernet import Fernet
+from hypothesis import given, strategies as st
 
 from app.security import (
     SecureKeyManager,
@@ -34,36 +34,34 @@ class TestSecureKeyManager:
         assert isinstance(key2, bytes)
         assert key1 != key2  # Should be different
 
-    def test_save_and_load_key(self):
+    def test_save_and_load_key(self, tmp_path):
         """Test key saving and loading."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            key_path = Path(temp_dir) / "test_key.json"
-            key_manager = SecureKeyManager(key_path)
+        key_path = tmp_path / "test_key.json"
+        key_manager = SecureKeyManager(key_path)
 
-            # Generate and save key
-            master_key = key_manager.generate_master_key("test_password")
-            key_manager.save_master_key("test_password")
+        # Generate and save key
+        master_key = key_manager.generate_master_key("test_password")
+        key_manager.save_master_key("test_password")
 
-            # Load key with correct password
-            new_key_manager = SecureKeyManager(key_path)
-            loaded_key = new_key_manager.load_master_key("test_password")
+        # Load key with correct password
+        new_key_manager = SecureKeyManager(key_path)
+        loaded_key = new_key_manager.load_master_key("test_password")
 
-            assert loaded_key == master_key
+        assert loaded_key == master_key
 
-    def test_invalid_password(self):
+    def test_invalid_password(self, tmp_path):
         """Test loading key with invalid password."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            key_path = Path(temp_dir) / "test_key.json"
-            key_manager = SecureKeyManager(key_path)
+        key_path = tmp_path / "test_key.json"
+        key_manager = SecureKeyManager(key_path)
 
-            # Generate and save key
-            key_manager.generate_master_key("correct_password")
-            key_manager.save_master_key("correct_password")
+        # Generate and save key
+        key_manager.generate_master_key("correct_password")
+        key_manager.save_master_key("correct_password")
 
-            # Try to load with wrong password
-            new_key_manager = SecureKeyManager(key_path)
-            with pytest.raises(InvalidKeyError):
-                new_key_manager.load_master_key("wrong_password")
+        # Try to load with wrong password
+        new_key_manager = SecureKeyManager(key_path)
+        with pytest.raises(InvalidKeyError):
+            new_key_manager.load_master_key("wrong_password")
 
     def test_key_strength_validation(self):
         """Test key strength validation."""
@@ -87,14 +85,13 @@ class TestSecureKeyManager:
         assert not is_strong
         assert "repetitive" in feedback
 
-    def test_missing_key_file(self):
+    def test_missing_key_file(self, tmp_path):
         """Test loading non-existent key file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            key_path = Path(temp_dir) / "nonexistent_key.json"
-            key_manager = SecureKeyManager(key_path)
+        key_path = tmp_path / "nonexistent_key.json"
+        key_manager = SecureKeyManager(key_path)
 
-            with pytest.raises(KeyNotFoundError):
-                key_manager.load_master_key()
+        with pytest.raises(KeyNotFoundError):
+            key_manager.load_master_key()
 
 
 class TestInputValidator:
@@ -113,19 +110,20 @@ class TestInputValidator:
             validated = InputValidator.validate_reflection_text(text)
             assert validated == text.strip()
 
-    def test_validate_reflection_text_invalid(self):
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("", id="empty"),
+            pytest.param("A" * 6000, id="too_long"),
+            pytest.param("DROP TABLE users;", id="sql_injection"),
+            pytest.param("<script>alert('xss')</script>", id="xss"),
+            pytest.param("File: C:\\Windows\\system32", id="path_traversal"),
+        ],
+    )
+    def test_validate_reflection_text_invalid(self, text):
         """Test validation of invalid reflection text."""
-        invalid_texts = [
-            "",  # Empty
-            "A" * 6000,  # Too long
-            "DROP TABLE users;",  # SQL injection
-            "<script>alert('xss')</script>",  # XSS
-            "File: C:\\Windows\\system32",  # Path traversal
-        ]
-
-        for text in invalid_texts:
-            with pytest.raises(ValidationError):
-                InputValidator.validate_reflection_text(text)
+        with pytest.raises(ValidationError):
+            InputValidator.validate_reflection_text(text)
 
     def test_validate_filename(self):
         """Test filename validation."""
@@ -141,17 +139,19 @@ class TestInputValidator:
             validated = InputValidator.validate_filename(name)
             assert validated == name
 
-        # Invalid filenames
-        invalid_names = [
-            "",  # Empty
-            "../../../etc/passwd",  # Path traversal
-            "file<with>bad:chars?.txt",  # Invalid chars
-            "exe_file.exe",  # Dangerous extension
-        ]
-
-        for name in invalid_names:
-            with pytest.raises(ValidationError):
-                InputValidator.validate_filename(name)
+    @pytest.mark.parametrize(
+        "name",
+        [
+            pytest.param("", id="empty"),
+            pytest.param("../../../etc/passwd", id="path_traversal"),
+            pytest.param("file<with>bad:chars?.txt", id="invalid_chars"),
+            pytest.param("exe_file.exe", id="dangerous_extension"),
+        ],
+    )
+    def test_validate_filename_invalid(self, name):
+        """Test validation of invalid filenames."""
+        with pytest.raises(ValidationError):
+            InputValidator.validate_filename(name)
 
     def test_sanitize_output(self):
         """Test output sanitization."""
@@ -195,33 +195,31 @@ class TestSecureRandom:
         custom_nonce = SecureRandom.generate_nonce(32)
         assert len(custom_nonce) == 32
 
-    def test_generate_password(self):
+    @given(length=st.integers(min_value=8, max_value=64))
+    def test_generate_password(self, length):
         """Test password generation."""
-        password = SecureRandom.generate_password()
+        password = SecureRandom.generate_password(length)
         assert isinstance(password, str)
-        assert len(password) == 16
+        assert len(password) == length
 
-        # Check password contains expected character types
-        has_upper = any(c.isupper() for c in password)
-        has_lower = any(c.islower() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in "!@#$%^&*" for c in password)
+        # Every password contains each character type
+        assert any(c.isupper() for c in password)
+        assert any(c.islower() for c in password)
+        assert any(c.isdigit() for c in password)
+        assert any(c in "!@#$%^&*" for c in password)
 
-        assert has_upper and has_lower and has_digit and has_special
-
-        # Test custom length
-        short_password = SecureRandom.generate_password(8)
-        assert len(short_password) == 8
+    def test_generate_password_default_length(self):
+        """Test the default password length."""
+        assert len(SecureRandom.generate_password()) == 16
 
 
 class TestSecureDelete:
     """Test secure file deletion."""
 
-    def test_secure_delete_existing_file(self):
+    def test_secure_delete_existing_file(self, tmp_path):
         """Test secure deletion of existing file."""
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file.write(b"secret data")
-            temp_path = Path(temp_file.name)
+        temp_path = tmp_path / "secret.bin"
+        temp_path.write_bytes(b"secret data")
 
         assert temp_path.exists()
 
@@ -242,23 +240,22 @@ class TestSecureDelete:
 class TestIntegration:
     """Integration tests for security features."""
 
-    def test_full_key_lifecycle(self):
+    def test_full_key_lifecycle(self, tmp_path):
         """Test complete key generation, storage, and retrieval cycle."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            key_path = Path(temp_dir) / "vault_key.json"
+        key_path = tmp_path / "vault_key.json"
 
-            # Generate key
-            key_manager = SecureKeyManager(key_path)
-            original_key = key_manager.generate_master_key("test_password")
+        # Generate key
+        key_manager = SecureKeyManager(key_path)
+        original_key = key_manager.generate_master_key("test_password")
 
-            # Save key
-            key_manager.save_master_key("test_password")
+        # Save key
+        key_manager.save_master_key("test_password")
 
-            # Load key
-            new_manager = SecureKeyManager(key_path)
-            loaded_key = new_manager.load_master_key("test_password")
+        # Load key
+        new_manager = SecureKeyManager(key_path)
+        loaded_key = new_manager.load_master_key("test_password")
 
-            assert loaded_key == original_key
+        assert loaded_key == original_key
 
     def test_input_validation_pipeline(self):
         """Test input validation in a pipeline."""
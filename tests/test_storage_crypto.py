@@ -0,0 +1,39 @@
+"""
+Tests for the encrypted vault's cipher handling.
+"""
+
+from app.storage import EncryptedVault
+
+
+class TestVaultCipher:
+    """Test how EncryptedVault builds its Fernet cipher."""
+
+    def test_bytearray_key(self, tmp_path, master_key):
+        """Test a mutable bytearray key opens the vault like bytes does."""
+        vault = EncryptedVault(str(tmp_path / "vault.db"), bytearray(master_key))
+        try:
+            reflection_id = vault.add_reflection("Stored with a bytearray key")
+            assert vault.get_reflection(reflection_id)[0] == (
+                "Stored with a bytearray key"
+            )
+        finally:
+            vault.close()
+
+        # Data written with the bytearray key reads back with the bytes key
+        vault = EncryptedVault(str(tmp_path / "vault.db"), master_key)
+        try:
+            assert vault.get_reflection(reflection_id) is not None
+        finally:
+            vault.close()
+
+    def test_each_vault_owns_its_cipher(self, tmp_path, master_key):
+        """Test vaults never share a cipher, so closing one leaves others intact."""
+        first = EncryptedVault(str(tmp_path / "first.db"), master_key)
+        second = EncryptedVault(str(tmp_path / "second.db"), master_key)
+        assert first.cipher is not second.cipher
+
+        first.close()
+
+        reflection_id = second.add_reflection("Still writable after the other closes")
+        assert second.get_reflection(reflection_id) is not None
+        second.close()
@@ -0,0 +1,149 @@
+"""
+Tests for utility helpers.
+"""
+
+import json
+import math
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+from app.utils import (
+    calculate_hash,
+    calculate_hashes_batch,
+    calculate_file_hash,
+    calculate_hash_iter,
+    calculate_hash_json,
+    is_valid_json,
+    safe_json_dumps,
+    safe_json_loads,
+    validate_email,
+)
+
+
+class TestJsonHelpers:
+    """JSON helpers must behave like stdlib json, with or without orjson."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param('{"a": [1, 2.5, null, true], "b": "\\u00e9"}', id="document"),
+            pytest.param("123456789012345678901234567890", id="big_int"),
+            pytest.param("-9223372036854775809", id="below_int64"),
+            pytest.param("18446744073709551616", id="above_uint64"),
+            pytest.param('{"id": 12345678901234567890123}', id="nested_big_int"),
+            pytest.param("[1e400]", id="float_overflow"),
+        ],
+    )
+    def test_safe_json_loads_matches_stdlib(self, text):
+        """Test parsed values, including big ints, equal stdlib's."""
+        result = safe_json_loads(text)
+        assert result == json.loads(text)
+        assert type(result) is type(json.loads(text))
+
+    @pytest.mark.parametrize("text", ["NaN", "Infinity", "-Infinity", "[NaN]"])
+    def test_non_finite_values(self, text):
+        """Test the non-finite constants stdlib json accepts."""
+        assert is_valid_json(text)
+        value = safe_json_loads(text)
+        value = value[0] if isinstance(value, list) else value
+        assert math.isnan(value) or math.isinf(value)
+
+    @pytest.mark.parametrize(
+        "text", ["", "not json", "{'a': 1}", "[1, 2", "Nope", "Infinite"]
+    )
+    def test_invalid_json(self, text):
+        """Test invalid input returns the default and fails validation."""
+        assert safe_json_loads(text, default="fallback") == "fallback"
+        assert not is_valid_json(text)
+
+    def test_safe_json_dumps_matches_stdlib(self):
+        """Test output is identical to json.dumps(indent=2, default=str)."""
+        data = {
+            "when": datetime(2025, 1, 1, 3, 4, 5),
+            "text": "caf\u00e9 \u2028",
+            "ratio": float("nan"),
+            "big": 1e16,
+            "huge": 2**70,
+            1: [None, True],
+        }
+        expected = json.dumps(data, indent=2, default=str)
+        assert safe_json_dumps(data) == expected
+        assert '"2025-01-01 03:04:05"' in expected
+        assert "\\u00e9" in expected
+
+
+class TestValidateEmail:
+    """Test email validation."""
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "user@example.com",
+            "first.last+tag@sub.example.org",
+            "a_b%c-d@host-name.io",
+        ],
+    )
+    def test_valid_emails(self, email):
+        """Test addresses that should be accepted."""
+        assert validate_email(email)
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            pytest.param("", id="empty"),
+            pytest.param("userexample.com", id="no_at"),
+            pytest.param("@example.com", id="empty_local"),
+            pytest.param("user@.com", id="empty_domain"),
+            pytest.param("user@example.c", id="short_tld"),
+            pytest.param("user@example.c0m", id="non_alpha_tld"),
+            pytest.param("user@exa@mple.com", id="two_ats"),
+            pytest.param("us er@example.com", id="space"),
+            pytest.param("user@example.com\n", id="trailing_newline"),
+            pytest.param(None, id="not_a_string"),
+        ],
+    )
+    def test_invalid_emails(self, email):
+        """Test addresses that should be rejected."""
+        assert not validate_email(email)
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "sha256", "sha512", "sha3_256"])
+class TestHashHelpers:
+    """Hash helpers must agree with calculate_hash for the same input."""
+
+    def test_calculate_hashes_batch(self, algorithm):
+        """Test batch hashing of mixed str and bytes items."""
+        items = ["alpha", b"beta", "", "unicod\u00e9"]
+        expected = [calculate_hash(item, algorithm) for item in items]
+        assert calculate_hashes_batch(items, algorithm) == expected
+        assert calculate_hashes_batch([], algorithm) == []
+
+    def test_calculate_file_hash(self, tmp_path, algorithm):
+        """Test file hashing across multiple read chunks."""
+        data = bytes(range(256)) * 1024  # Larger than one 64 KiB chunk
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(data)
+
+        assert calculate_file_hash(file_path, algorithm) == calculate_hash(
+            data, algorithm
+        )
+        assert calculate_file_hash(str(file_path), algorithm) == calculate_hash(
+            data, algorithm
+        )
+
+    def test_calculate_hash_iter(self, algorithm):
+        """Test hashing chunks equals hashing their concatenation."""
+        chunks = ["Hello, ", b"World", "!"]
+        assert calculate_hash_iter(chunks, algorithm) == calculate_hash(
+            "Hello, World!", algorithm
+        )
+        assert calculate_hash_iter([], algorithm) == calculate_hash("", algorithm)
+
+    def test_calculate_hash_json(self, algorithm):
+        """Test JSON hashing matches hashing json.dumps output."""
+        data = {"b": [1, 2.5, None], "a": {"nested": True}, "when": Path("x")}
+        encoded = json.dumps(data, default=str)
+        assert calculate_hash_json(data, algorithm) == calculate_hash(
+            encoded, algorithm
+        )